@@ -1,7 +1,8 @@
 """
-Development server for PL4M API.
+Application factory for PL4M API.
 
-This module provides a development server with debug mode and CORS support.
+This module provides the production app factory and a development variant
+with debug mode enabled. Both are served by gunicorn (see gunicorn.conf.py).
 """
 
 from flask import Flask
@@ -9,16 +10,22 @@ from flask_cors import CORS
 from pl4m_utils.api import content_bp
 import os
 
-def create_dev_app():
-    """Create Flask app with development configuration."""
+def create_app():
+    """Create Flask app with production configuration."""
     app = Flask(__name__)
     
     # Register the API blueprint
     app.register_blueprint(content_bp)
     
-    # Enable CORS for development
+    # Enable CORS for the website
     CORS(app)
     
+    return app
+
+def create_dev_app():
+    """Create Flask app with development configuration."""
+    app = create_app()
+    
     # Development configuration
     app.config.update(
         DEBUG=True,
@@ -28,10 +35,17 @@ def create_dev_app():
     return app
 
 def main():
-    """Run the development server."""
-    port = int(os.environ.get('PORT', 8887))
-    app = create_dev_app()
-    app.run(host='0.0.0.0', port=port)
+    """Run the development server under gunicorn."""
+    api_dir = os.path.dirname(os.path.abspath(__file__))
+    os.environ.setdefault('PORT', '8887')
+    os.execvp('gunicorn', [
+        'gunicorn',
+        '--config', os.path.join(api_dir, 'gunicorn.conf.py'),
+        '--chdir', api_dir,
+        '--reload',
+        # Through wsgi, so gevent and gRPC are patched as in production
+        'wsgi:create_dev_app()'
+    ])
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
@@ -22,6 +22,23 @@ function run_locally() {
   # docker rmi $LOCAL_IMAGE
 }
 
+function migrate_deleted() {
+  # Moves documents soft-deleted in place into their {collection}__deleted
+  # partition; live listings no longer filter on deleted_at, so this must run
+  # for every revision that partitions. Idempotent, so safe to repeat.
+  echo "🗂️  Moving soft-deleted documents into their deleted partitions..."
+  docker run --rm \
+    -v "$HOME/.config/gcloud:/root/.config/gcloud:ro" \
+    -e GOOGLE_CLOUD_PROJECT=$PROJECT_ID \
+    $1 python -c "
+from pl4m_utils.config import CONTENT_TYPES, get_collection_name
+from pl4m_utils.metadata_manager import MetadataManager
+for content_type in CONTENT_TYPES:
+    collection = get_collection_name(content_type)
+    print(f'{collection}: moved {MetadataManager.partition_deleted(collection)}')
+" || exit 1
+}
+
 function deploy_to_cloudrun() {
   echo "🚀 Starting Deployment Process for Cloud Run..."
 
@@ -37,7 +54,10 @@ function deploy_to_cloudrun() {
   echo "📤 Pushing Docker image to Artifact Registry..."
   docker push $IMAGE_URI
 
-  # 4️⃣ Deploy to Cloud Run
+  # 4️⃣ Migrate soft-deleted documents before the new revision lists them
+  migrate_deleted $IMAGE_URI
+
+  # 5️⃣ Deploy to Cloud Run
   echo "🚀 Deploying Cloud Run service..."
   gcloud run deploy $SERVICE_NAME \
     --image=$IMAGE_URI \
@@ -47,7 +67,10 @@ function deploy_to_cloudrun() {
     --memory=512Mi \
     --cpu=1
 
-  # 5️⃣ Get the Cloud Run Service URL
+  # 6️⃣ Catch documents the previous revision soft-deleted during the rollout
+  migrate_deleted $IMAGE_URI
+
+  # 7️⃣ Get the Cloud Run Service URL
   SERVICE_URL=$(gcloud run services describe $SERVICE_NAME \
     --region=$REGION --format='value(status.url)')
 
@@ -0,0 +1,16 @@
+"""
+Gunicorn configuration for PL4M API.
+
+Shared by the container entrypoint and the local development server. The
+workload is dominated by GCS/Firestore round trips, so gevent workers are used
+to overlap requests instead of serializing them on a single thread.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8080)}"
+# Each worker holds its own clients, thread pool and caches, so a small
+# container runs few workers and relies on worker_connections for concurrency
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = 'gevent'
+worker_connections = int(os.environ.get('WORKER_CONNECTIONS', 1000))
@@ -0,0 +1,18 @@
+"""
+WSGI entrypoint for PL4M API, in production and development.
+
+gevent must patch the standard library before anything else imports sockets,
+so that blocking GCS calls yield to other requests in the worker. Firestore
+talks gRPC, which bypasses the patched sockets, so gRPC is switched to its
+gevent-aware poller before any client is created.
+"""
+
+from gevent import monkey
+monkey.patch_all()
+
+import grpc.experimental.gevent as grpc_gevent
+grpc_gevent.init_gevent()
+
+from app import create_app, create_dev_app  # create_dev_app is served by app.main()
+
+application = create_app()
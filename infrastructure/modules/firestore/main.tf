@@ -3,17 +3,25 @@ resource "google_firestore_database" "default" {
   name        = "(default)"
   location_id = "nam5"
   type        = "FIRESTORE_NATIVE"
+
+  # Writes are low-contention, so transactions validate at commit instead of
+  # taking locks that would block the read-heavy listing scans
+  concurrency_mode = "OPTIMISTIC"
 }
 
-# Soft delete with created_at index
-resource "google_firestore_index" "soft_delete_created_at" {
+# Soft-deleted documents live in {collection}__deleted partitions, so listing
+# indexes need no deleted_at prefix; single-field orderings use the automatic
+# single-field indexes
+
+# Tags with created_at index (both orders)
+resource "google_firestore_index" "tags_created_at" {
   for_each   = toset(var.metadata_collections)
   project    = var.project_id
   collection = each.value
 
   fields {
-    field_path = "deleted_at"
-    order      = "ASCENDING"
+    field_path   = "tags"
+    array_config = "CONTAINS"
   }
   fields {
     field_path = "created_at"
@@ -21,19 +29,18 @@ resource "google_firestore_index" "soft_delete_created_at" {
   }
 }
 
-# Soft delete with updated_at index
-resource "google_firestore_index" "soft_delete_updated_at" {
+resource "google_firestore_index" "tags_created_at_asc" {
   for_each   = toset(var.metadata_collections)
   project    = var.project_id
   collection = each.value
 
   fields {
-    field_path = "deleted_at"
-    order      = "ASCENDING"
+    field_path   = "tags"
+    array_config = "CONTAINS"
   }
   fields {
-    field_path = "updated_at"
-    order      = "DESCENDING"
+    field_path = "created_at"
+    order      = "ASCENDING"
   }
   fields {
     field_path = "__name__"
@@ -41,14 +48,15 @@ resource "google_firestore_index" "soft_delete_updated_at" {
   }
 }
 
-resource "google_firestore_index" "soft_delete_updated_at_nd" {
+# Tags with updated_at index (both orders)
+resource "google_firestore_index" "tags_updated_at" {
   for_each   = toset(var.metadata_collections)
   project    = var.project_id
   collection = each.value
 
   fields {
-    field_path = "deleted_at"
-    order      = "ASCENDING"
+    field_path   = "tags"
+    array_config = "CONTAINS"
   }
   fields {
     field_path = "updated_at"
@@ -60,14 +68,14 @@ resource "google_firestore_index" "soft_delete_updated_at_nd" {
   }
 }
 
-resource "google_firestore_index" "soft_delete_updated_at_asc" {
+resource "google_firestore_index" "tags_updated_at_asc" {
   for_each   = toset(var.metadata_collections)
   project    = var.project_id
   collection = each.value
 
   fields {
-    field_path = "deleted_at"
-    order      = "ASCENDING"
+    field_path   = "tags"
+    array_config = "CONTAINS"
   }
   fields {
     field_path = "updated_at"
@@ -79,46 +87,6 @@ resource "google_firestore_index" "soft_delete_updated_at_asc" {
   }
 }
 
-# Soft delete with updated_at and created_at index
-resource "google_firestore_index" "soft_delete_updated_created_at" {
-  for_each   = toset(var.metadata_collections)
-  project    = var.project_id
-  collection = each.value
-
-  fields {
-    field_path = "deleted_at"
-    order      = "ASCENDING"
-  }
-  fields {
-    field_path = "updated_at"
-    order      = "DESCENDING"
-  }
-  fields {
-    field_path = "created_at"
-    order      = "DESCENDING"
-  }
-  fields {
-    field_path = "__name__"
-    order      = "DESCENDING"
-  }
-}
-
-# Tags with created_at index
-resource "google_firestore_index" "tags_created_at" {
-  for_each   = toset(var.metadata_collections)
-  project    = var.project_id
-  collection = each.value
-
-  fields {
-    field_path   = "tags"
-    array_config = "CONTAINS"
-  }
-  fields {
-    field_path = "created_at"
-    order      = "DESCENDING"
-  }
-}
-
 # Title with created_at index (both orders)
 resource "google_firestore_index" "title_created_at" {
   for_each   = toset(var.metadata_collections)
@@ -197,8 +165,8 @@ resource "google_firestore_index" "updated_at_created_at_asc" {
   }
 }
 
-# Tags with soft delete, updated_at, and created_at index
-resource "google_firestore_index" "tags_soft_delete_updated_created_at" {
+# Tags with updated_at and created_at index
+resource "google_firestore_index" "tags_updated_created_at" {
   for_each   = toset(var.metadata_collections)
   project    = var.project_id
   collection = each.value
@@ -207,10 +175,6 @@ resource "google_firestore_index" "tags_soft_delete_updated_created_at" {
     field_path   = "tags"
     array_config = "CONTAINS"
   }
-  fields {
-    field_path = "deleted_at"
-    order      = "ASCENDING"
-  }
   fields {
     field_path = "updated_at"
     order      = "DESCENDING"
@@ -225,8 +189,8 @@ resource "google_firestore_index" "tags_soft_delete_updated_created_at" {
   }
 }
 
-# Tags with soft delete, updated_at, and created_at index (ascending)
-resource "google_firestore_index" "tags_soft_delete_updated_created_at_asc" {
+# Tags with updated_at and created_at index (ascending)
+resource "google_firestore_index" "tags_updated_created_at_asc" {
   for_each   = toset(var.metadata_collections)
   project    = var.project_id
   collection = each.value
@@ -235,10 +199,6 @@ resource "google_firestore_index" "tags_soft_delete_updated_created_at_asc" {
     field_path   = "tags"
     array_config = "CONTAINS"
   }
-  fields {
-    field_path = "deleted_at"
-    order      = "ASCENDING"
-  }
   fields {
     field_path = "updated_at"
     order      = "ASCENDING"
@@ -251,48 +211,4 @@ resource "google_firestore_index" "tags_soft_delete_updated_created_at_asc" {
     field_path = "__name__"
     order      = "ASCENDING"
   }
-}
-
-# Soft delete with created_at index (ascending)
-resource "google_firestore_index" "soft_delete_created_at_asc" {
-  for_each   = toset(var.metadata_collections)
-  project    = var.project_id
-  collection = each.value
-
-  fields {
-    field_path = "deleted_at"
-    order      = "ASCENDING"
-  }
-  fields {
-    field_path = "created_at"
-    order      = "ASCENDING"
-  }
-  fields {
-    field_path = "__name__"
-    order      = "ASCENDING"
-  }
-}
-
-# Tags with soft delete and updated_at index (ascending)
-resource "google_firestore_index" "tags_soft_delete_updated_at_asc" {
-  for_each   = toset(var.metadata_collections)
-  project    = var.project_id
-  collection = each.value
-
-  fields {
-    field_path   = "tags"
-    array_config = "CONTAINS"
-  }
-  fields {
-    field_path = "deleted_at"
-    order      = "ASCENDING"
-  }
-  fields {
-    field_path = "updated_at"
-    order      = "ASCENDING"
-  }
-  fields {
-    field_path = "__name__"
-    order      = "ASCENDING"
-  }
 }
\ No newline at end of file
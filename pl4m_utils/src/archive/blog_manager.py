@@ -126,7 +126,8 @@ class BlogManager(ContentManager):
             blob = bucket.blob(file_path)
             
             content_type = 'text/markdown'
-            blob.upload_from_string(content, content_type=content_type)
+            body = content.encode('utf-8')
+            blob.upload_from_string(body, content_type=content_type)
             
             # Create metadata record
             gcs_path = f"gs://{self.BUCKET}/{file_path}"
@@ -135,7 +136,7 @@ class BlogManager(ContentManager):
                 'gcs_path': gcs_path,
                 'bucket': self.BUCKET,
                 'blob_path': file_path,
-                'size_bytes': len(content.encode('utf-8')),
+                'size_bytes': len(body),
                 'content_type': content_type
             })
             
@@ -12,13 +12,19 @@ import sys
 import argparse
 import uuid
 import random
-from datetime import datetime, timedelta
-from typing import Dict, Any, List
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Any, List, Optional, Tuple, TypeVar
 
 from pl4m_utils import (
     ContentManager, DocumentManager, ImageManager, BlogManager
 )
 
+# Uploads are network-bound, so run them concurrently over shared clients
+MAX_WORKERS = 16
+
+T = TypeVar("T")
+
 # Sample content data
 SAMPLE_TEXT = """
 This is sample text content for testing purposes.
@@ -35,29 +41,73 @@ SAMPLE_PDF = b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj 2 0 obj<</Ty
 # Sample JPEG content - minimal header that appears to be a valid JPEG
 SAMPLE_JPEG = b'\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x01\x00H\x00H\x00\x00\xff\xdb\x00C\x00\xff\xc0\x00\x11\x08\x00\x01\x00\x01\x03\x01\x11\x00\x02\x11\x01\x03\x11\x01\xff\xc4\x00\x14\x00\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\xc4\x00\x14\x10\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\xda\x00\x08\x01\x01\x00\x00?\x00\xff\xd9'
 
+# One manager per content type, shared by every generator function
+_MANAGERS = {
+    "documents": DocumentManager(),
+    "images": ImageManager(),
+    "blog": BlogManager()
+}
+
+ALL_TAGS = (
+    "test", "sample", "demo", "example", "generated", "content", 
+    "pl4m", "automated", "tag", "metadata", "firestore", "storage"
+)
+
+# Reference time for all generated dates in this run
+_NOW = datetime.now(timezone.utc)
+
+_rng = random.Random()
+
 def generate_random_tags(min_count: int = 2, max_count: int = 5) -> List[str]:
     """Generate a random list of tags."""
-    all_tags = [
-        "test", "sample", "demo", "example", "generated", "content", 
-        "pl4m", "automated", "tag", "metadata", "firestore", "storage"
-    ]
-    count = random.randint(min_count, min(max_count, len(all_tags)))
-    return random.sample(all_tags, count)
+    count = _rng.randint(min_count, min(max_count, len(ALL_TAGS)))
+    
+    # Pick tags as bits of an integer mask; duplicates just set the same bit
+    mask = 0
+    while bin(mask).count('1') < count:
+        mask |= 1 << _rng.randrange(len(ALL_TAGS))
+    return [tag for i, tag in enumerate(ALL_TAGS) if mask >> i & 1]
 
 def generate_random_date(days_back: int = 365) -> datetime:
     """Generate a random date within the specified number of days back from now."""
-    max_seconds_back = days_back * 24 * 60 * 60
-    random_seconds = random.randint(0, max_seconds_back)
-    return datetime.utcnow() - timedelta(seconds=random_seconds)
+    return _NOW - timedelta(seconds=_rng.randrange(days_back * 86400 + 1))
+
+async def run_concurrently(make_one: Callable[[int], T], count: int) -> List[T]:
+    """Run make_one(i) for each index on worker threads, at most MAX_WORKERS at a time."""
+    semaphore = asyncio.Semaphore(MAX_WORKERS)
+    
+    async def _one(i: int) -> T:
+        async with semaphore:
+            return await asyncio.to_thread(make_one, i)
+    
+    return await asyncio.gather(*(_one(i) for i in range(count)))
 
-def create_test_documents(count: int = 3, use_specific_dates: bool = True) -> List[str]:
+def create_records(manager: ContentManager,
+                   uploads: List[Tuple[Dict[str, Any], Optional[datetime]]],
+                   label: str) -> List[str]:
+    """Store the metadata records for uploaded test content in one bulk write."""
+    if not uploads:
+        return []
+    
+    records, creation_dates = zip(*uploads)
+    try:
+        results = manager.create_content_records(list(records), list(creation_dates))
+    except Exception as e:
+        print(f"  - Error creating {label} records: {str(e)}")
+        return []
+    
+    for result in results:
+        print(f"  - Created {label}: {result['id']} - {result.get('title', result['blob_path'])}")
+    
+    return [result['id'] for result in results]
+
+async def create_test_documents(count: int = 3, use_specific_dates: bool = True) -> List[str]:
     """Create test PDF documents."""
-    document_ids = []
-    document_manager = DocumentManager()
+    document_manager = _MANAGERS["documents"]
     
     print(f"Creating {count} test documents...")
     
-    for i in range(count):
+    def _make_one(i: int) -> Optional[Tuple[Dict[str, Any], Optional[datetime]]]:
         # Generate unique filename
         filename = f"test_document_{uuid.uuid4().hex[:8]}.pdf"
         
@@ -76,33 +126,32 @@ def create_test_documents(count: int = 3, use_specific_dates: bool = True) -> Li
             print(f"  - Using custom creation date: {creation_date}")
         
         try:
-            # Upload document
-            result = document_manager.upload_new_content(
+            # Upload document file; its record is created in bulk below
+            record = document_manager.upload_file(
                 filename=filename,
                 content=SAMPLE_PDF,
-                metadata=metadata,
-                creation_date=creation_date
+                metadata=metadata
             )
-            
-            document_ids.append(result['id'])
-            print(f"  - Created document {i+1}: {result['id']} - {metadata['title']}")
+            return record, creation_date
             
         except Exception as e:
-            print(f"  - Error creating document {i+1}: {str(e)}")
+            print(f"  - Error uploading document {i+1}: {str(e)}")
+            return None
+    
+    uploads = [u for u in await run_concurrently(_make_one, count) if u]
     
-    return document_ids
+    return await asyncio.to_thread(create_records, document_manager, uploads, "document")
 
-def create_test_images(count: int = 3) -> List[str]:
+async def create_test_images(count: int = 3) -> List[str]:
     """Create test JPEG images."""
-    image_ids = []
-    image_manager = ImageManager()
+    image_manager = _MANAGERS["images"]
     
     print(f"Creating {count} test images...")
     
-    for i in range(count):
+    def _make_one(i: int) -> Optional[Tuple[Dict[str, Any], Optional[datetime]]]:
         # Generate unique filename with different extensions to test MIME type mapping
         extensions = ['.jpg', '.png', '.gif', '.webp']
-        ext = random.choice(extensions)
+        ext = _rng.choice(extensions)
         filename = f"test_image_{uuid.uuid4().hex[:8]}{ext}"
         
         # Create image metadata
@@ -115,30 +164,28 @@ def create_test_images(count: int = 3) -> List[str]:
         try:
             # Upload image - using the same JPEG sample data regardless of extension
             # just to demonstrate the capability
-            result = image_manager.upload_new_content(
+            record = image_manager.upload_file(
                 filename=filename,
                 content=SAMPLE_JPEG,
                 metadata=metadata
             )
-            
-            image_ids.append(result['id'])
-            print(f"  - Created image {i+1}: {result['id']} - {filename}")
+            return record, None
             
         except Exception as e:
-            print(f"  - Error creating image {i+1}: {str(e)}")
+            print(f"  - Error uploading image {i+1}: {str(e)}")
+            return None
     
-    return image_ids
+    uploads = [u for u in await run_concurrently(_make_one, count) if u]
+    
+    return await asyncio.to_thread(create_records, image_manager, uploads, "image")
 
-def create_test_blog_posts(count: int = 3) -> List[str]:
+async def create_test_blog_posts(count: int = 3) -> List[str]:
     """Create test markdown blog posts."""
-    post_ids = []
-    
-    # Use the generic ContentManager directly to show it works the same
-    blog_manager = ContentManager(content_type="blog")
+    blog_manager = _MANAGERS["blog"]
     
     print(f"Creating {count} test blog posts...")
     
-    for i in range(count):
+    def _make_one(i: int) -> Optional[Tuple[Dict[str, Any], Optional[datetime]]]:
         # Generate unique filename
         filename = f"test_post_{uuid.uuid4().hex[:8]}.md"
         
@@ -167,72 +214,62 @@ _Posted by {metadata['author']} on {metadata['publish_date'].strftime('%Y-%m-%d'
         
         try:
             # Upload blog post
-            result = blog_manager.upload_new_content(
+            record = blog_manager.upload_file(
                 filename=filename,
                 content=content,
                 metadata=metadata
             )
-            
-            post_ids.append(result['id'])
-            print(f"  - Created blog post {i+1}: {result['id']} - {metadata['title']}")
+            return record, None
             
         except Exception as e:
-            print(f"  - Error creating blog post {i+1}: {str(e)}")
+            print(f"  - Error uploading blog post {i+1}: {str(e)}")
+            return None
+    
+    uploads = [u for u in await run_concurrently(_make_one, count) if u]
     
-    return post_ids
+    return await asyncio.to_thread(create_records, blog_manager, uploads, "blog post")
 
-def update_test_content(content_ids: List[str]) -> None:
+async def update_test_content(content_ids: List[str]) -> None:
     """Update some of the test content to demonstrate update methods."""
     if not content_ids:
         print("No content IDs provided for update testing")
         return
     
     # Pick a random content ID to update
-    content_id = random.choice(content_ids)
-    
-    # Create a generic content manager (we could also determine the type and use a specific manager)
-    content_manager = ContentManager(content_type="documents")  # Type doesn't matter for reading/updating
+    content_id = _rng.choice(content_ids)
     
     print(f"Updating test content: {content_id}")
     
     try:
-        # Get the content
-        content = content_manager.get_content(content_id)
-        if not content:
-            print(f"  - Content not found: {content_id}")
-            return
-        
-        # Determine the type based on content_type or collection
-        content_type = None
-        if 'content_type' in content:
-            if 'markdown' in content['content_type']:
-                content_type = "blog"
-            elif 'pdf' in content['content_type']:
-                content_type = "documents"
-            elif 'image/' in content['content_type']:
-                content_type = "images"
-        
+        # Each content type has its own collection, so look in all of them at once
+        found = await asyncio.gather(*(
+            asyncio.to_thread(manager.get_content, content_id) for manager in _MANAGERS.values()
+        ))
+        content_type = next(
+            (name for name, content in zip(_MANAGERS, found) if content),
+            None
+        )
         if not content_type:
-            print(f"  - Could not determine content type for: {content_id}")
+            print(f"  - Content not found: {content_id}")
             return
         
-        # Create the appropriate manager
-        manager = ContentManager(content_type=content_type)
+        manager = _MANAGERS[content_type]
         
         # Update the metadata
+        updated_at = datetime.now(timezone.utc).isoformat()
         update_data = {
             "tags": generate_random_tags(),
-            "description": f"Updated description: {datetime.utcnow().isoformat()}"
+            "description": f"Updated description: {updated_at}"
         }
         
-        result = manager.update_metadata(content_id, update_data)
+        await asyncio.to_thread(manager.update_metadata, content_id, update_data)
         print(f"  - Updated metadata for {content_id}: {update_data['description']}")
         
         # If it's a blog post, also update the content
         if content_type == "blog":
             new_content = f"""# Updated Blog Post
 
-This content was updated on {datetime.utcnow().isoformat()}
+This content was updated on {updated_at}
 
 {SAMPLE_TEXT}
 
@@ -240,12 +277,30 @@ This content was updated on {datetime.utcnow().isoformat()}
 
 {', '.join(update_data['tags'])}
 """
-            manager.update_content(content_id, new_content)
+            await asyncio.to_thread(manager.update_content, content_id, new_content)
             print(f"  - Updated content for blog post: {content_id}")
         
     except Exception as e:
         print(f"  - Error updating content {content_id}: {str(e)}")
 
+async def generate_content(args: argparse.Namespace) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """Create all requested test content, then optionally update some of it."""
+    # Create test content - the three content types are independent
+    doc_ids, image_ids, post_ids = await asyncio.gather(
+        create_test_documents(args.documents),
+        create_test_images(args.images),
+        create_test_blog_posts(args.blog_posts)
+    )
+    
+    # Combine all content IDs
+    all_content_ids = doc_ids + image_ids + post_ids
+    
+    # Update some content if requested
+    if not args.no_updates and all_content_ids:
+        await update_test_content(all_content_ids)
+    
+    return doc_ids, image_ids, post_ids, all_content_ids
+
 def main():
     """Main function to run the test content generator."""
     parser = argparse.ArgumentParser(description='Generate test content for PL4M utilities')
@@ -259,17 +314,7 @@ def main():
     print("PL4M Test Content Generator")
     print("==========================")
     
-    # Create test content
-    doc_ids = create_test_documents(args.documents)
-    image_ids = create_test_images(args.images)
-    post_ids = create_test_blog_posts(args.blog_posts)
-    
-    # Combine all content IDs
-    all_content_ids = doc_ids + image_ids + post_ids
-    
-    # Update some content if requested
-    if not args.no_updates and all_content_ids:
-        update_test_content(all_content_ids)
+    doc_ids, image_ids, post_ids, all_content_ids = asyncio.run(generate_content(args))
     
     print("\nTest Content Generation Summary:")
     print(f"  - Documents created: {len(doc_ids)}")
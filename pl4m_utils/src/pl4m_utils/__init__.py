@@ -1,5 +1,8 @@
-from pl4m_utils.metadata_manager import MetadataManager, MetadataManagerError
-from pl4m_utils.content_manager import ContentManager, ContentManagerError
+from pl4m_utils.metadata_manager import (
+    AlreadyExistsError, AsyncMetadataManager, MetadataManager, MetadataManagerError,
+    NotFoundError, RetryableError
+)
+from pl4m_utils.content_manager import ContentManager, ContentManagerError, ContentNotFoundError
 from pl4m_utils.config import (
     get_bucket_name, get_content_type_config, 
     get_collection_name, get_mime_type, CONTENT_TYPES
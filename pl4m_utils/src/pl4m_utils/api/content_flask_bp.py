@@ -5,17 +5,62 @@ This module provides REST endpoints for interacting with the content management
 including uploading, retrieving, updating, and deleting content of various types.
 """
 
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-import io
+from functools import lru_cache
+import hashlib
+import heapq
 import json
+import orjson
+import os
 from typing import Dict, Any, Optional, List
-from pl4m_utils import ContentManager, ContentManagerError
-from pl4m_utils.config import CONTENT_TYPES
+from pl4m_utils import ContentManager, ContentManagerError, ContentNotFoundError, MetadataManager
+from pl4m_utils.config import CONTENT_TYPES, CONTENT_TYPES_VIEW
+from pl4m_utils.content_manager import CONCURRENT_DOWNLOAD_THRESHOLD
 
 # Create Blueprint instead of Flask app
 bp = Blueprint('content', __name__)
 
+# Bytes yielded to the client per read when streaming content
+STREAM_READ_SIZE = 1 << 20
+
+# Bytes fetched from GCS per ranged request when streaming content
+STREAM_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Serialized once; the content types configuration does not change at runtime
+CONTENT_TYPES_JSON = orjson.dumps(CONTENT_TYPES_VIEW)
+CONTENT_TYPES_ETAG = hashlib.sha1(CONTENT_TYPES_JSON).hexdigest()
+
+# Content types only change on deploy; content bodies can be replaced via
+# PATCH, so clients must revalidate them against the blob generation
+CONTENT_TYPES_CACHE_CONTROL = 'public, max-age=3600'
+CONTENT_CACHE_CONTROL = 'public, no-cache'
+
+# Tags one list request may filter by; each 10 beyond the first costs another query
+MAX_FILTER_TAGS = 50
+
+def _ojson(obj: Any, status: int = 200) -> Response:
+    """
+    Build a JSON response using orjson.
+    
+    Every endpoint returning documents uses this, so datetimes are always
+    ISO 8601 strings as in openapi.yaml.
+    """
+    return Response(
+        MetadataManager.to_json(obj),
+        status=status,
+        mimetype='application/json'
+    )
+
+@lru_cache(maxsize=len(CONTENT_TYPES))
+def _get_manager(content_type: str) -> ContentManager:
+    """Return the shared ContentManager for a content type."""
+    return ContentManager(content_type=content_type)
+
+# Managers are rebuilt in a forked worker rather than shared with the parent
+os.register_at_fork(after_in_child=_get_manager.cache_clear)
+
 def parse_date(date_str: Optional[str]) -> Optional[datetime]:
     """Parse date string into datetime object."""
     if not date_str:
@@ -33,6 +78,14 @@ def handle_content_error(error):
         'type': 'ContentManagerError'
     }), 400
 
+@bp.errorhandler(ContentNotFoundError)
+def handle_not_found_error(error):
+    """Handle requests for content that does not exist."""
+    return jsonify({
+        'error': str(error),
+        'type': 'ContentNotFoundError'
+    }), 404
+
 @bp.errorhandler(ValueError)
 def handle_value_error(error):
     """Handle validation errors."""
@@ -44,16 +97,10 @@ def handle_value_error(error):
 @bp.route('/api/content/types', methods=['GET'])
 def list_content_types():
     """List available content types and their configurations."""
-    return jsonify({
-        'content_types': {
-            type_name: {
-                'valid_extensions': list(config['valid_extensions']),
-                'required_metadata': list(config['required_metadata']),
-                'optional_metadata': list(config.get('optional_metadata', [])),
-            }
-            for type_name, config in CONTENT_TYPES.items()
-        }
-    })
+    response = Response(CONTENT_TYPES_JSON, mimetype='application/json')
+    response.headers['Cache-Control'] = CONTENT_TYPES_CACHE_CONTROL
+    response.set_etag(CONTENT_TYPES_ETAG)
+    return response.make_conditional(request)
 
 @bp.route('/api/content/<content_type>', methods=['POST'])
 def upload_content(content_type: str):
@@ -81,17 +128,17 @@ def upload_content(content_type: str):
     creation_date = parse_date(request.form.get('creation_date'))
     path_date = parse_date(request.form.get('path_date'))
 
-    manager = ContentManager(content_type=content_type)
+    manager = _get_manager(content_type)
     
     result = manager.upload_new_content(
         filename=file.filename,
-        content=file.read(),
+        content=file.stream,
         metadata=metadata,
         date=path_date,
         creation_date=creation_date
     )
     
-    return jsonify(result), 201
+    return _ojson(result, 201)
 
 @bp.route('/api/content/<content_type>/<content_id>', methods=['GET'])
 def get_content(content_type: str, content_id: str):
@@ -101,7 +148,7 @@ def get_content(content_type: str, content_id: str):
     Query parameters:
     - metadata_only: If 'true', only return metadata without content
     """
-    manager = ContentManager(content_type=content_type)
+    manager = _get_manager(content_type)
     
     # Get the content metadata
     metadata = manager.get_content(content_id)
@@ -110,23 +157,46 @@ def get_content(content_type: str, content_id: str):
 
     # Return only metadata if requested
     if request.args.get('metadata_only') == 'true':
-        return jsonify(metadata)
+        return _ojson(metadata)
 
     # Get the actual content from GCS
     try:
-        bucket = manager.storage_client.bucket(metadata['bucket'])
-        blob = bucket.blob(metadata['blob_path'])
-        content = blob.download_as_bytes()
+        blob = manager.get_blob(metadata['blob_path'], metadata['bucket'])
+        blob.reload()
+        
+        # The blob generation changes whenever the content is overwritten
+        etag = str(blob.generation)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+            response.headers['Cache-Control'] = CONTENT_CACHE_CONTROL
+            response.set_etag(etag)
+            return response
+        
+        # Stream the blob in chunks rather than buffering it in memory;
+        # large blobs are fetched as parallel ranges to use more bandwidth
+        if blob.size > CONCURRENT_DOWNLOAD_THRESHOLD:
+            body = manager.iter_blob_ranges(blob)
+        else:
+            fh = blob.open('rb', chunk_size=STREAM_CHUNK_SIZE)
             
-        # Create in-memory file
-        file_obj = io.BytesIO(content)
+            def generate():
+                with fh:
+                    yield from iter(lambda: fh.read(STREAM_READ_SIZE), b'')
+            
+            body = generate()
         
-        return send_file(
-            file_obj,
+        filename = metadata.get('blob_path', '').split('/')[-1]
+        response = Response(
+            stream_with_context(body),
             mimetype=metadata.get('content_type', 'application/octet-stream'),
-            as_attachment=True,
-            download_name=metadata.get('blob_path', '').split('/')[-1]
+            headers={
+                'Content-Disposition': f'attachment; filename="{filename}"',
+                'Content-Length': str(blob.size),
+                'Cache-Control': CONTENT_CACHE_CONTROL
+            }
         )
+        response.set_etag(etag)
+        return response
     except Exception as e:
         return jsonify({'error': f'Error retrieving content: {str(e)}'}), 500
 
@@ -141,11 +211,7 @@ def update_content(content_type: str, content_id: str):
         "content": base64_encoded_content  # Optional
     }
     """
-    manager = ContentManager(content_type=content_type)
-    
-    # Verify content exists
-    if not manager.get_content(content_id):
-        return jsonify({'error': 'Content not found'}), 404
+    manager = _get_manager(content_type)
 
     data = request.get_json()
     if not data:
@@ -157,6 +223,8 @@ def update_content(content_type: str, content_id: str):
     if 'metadata' in data:
         try:
             result['metadata'] = manager.update_metadata(content_id, data['metadata'])
+        except ContentNotFoundError:
+            raise
         except Exception as e:
             return jsonify({'error': f'Error updating metadata: {str(e)}'}), 400
 
@@ -167,10 +235,12 @@ def update_content(content_type: str, content_id: str):
             content = base64.b64decode(data['content'])
             # result['content'] = 
             manager.update_content(content_id, content)
+        except ContentNotFoundError:
+            raise
         except Exception as e:
             return jsonify({'error': f'Error updating content: {str(e)}'}), 400
 
-    return jsonify(result)
+    return _ojson(result)
 
 @bp.route('/api/content/<content_type>/<content_id>', methods=['DELETE'])
 def delete_content(content_type: str, content_id: str):
@@ -180,28 +250,27 @@ def delete_content(content_type: str, content_id: str):
     Query parameters:
     - hard_delete: If 'true', permanently delete content
     """
-    manager = ContentManager(content_type=content_type)
-    
-    # Verify content exists
-    if not manager.get_content(content_id):
-        return jsonify({'error': 'Content not found'}), 404
-
+    manager = _get_manager(content_type)
     hard_delete = request.args.get('hard_delete') == 'true'
     
     try:
         result = manager.delete_content(content_id, hard_delete=hard_delete)
         return jsonify({'success': result})
+    except (ContentNotFoundError, ValueError):
+        raise
     except Exception as e:
         return jsonify({'error': f'Error deleting content: {str(e)}'}), 500
 
 @bp.route('/api/content/<content_type>/<content_id>/restore', methods=['POST'])
 def restore_content(content_type: str, content_id: str):
     """Restore soft-deleted content."""
-    manager = ContentManager(content_type=content_type)
+    manager = _get_manager(content_type)
     
     try:
         result = manager.restore_content(content_id)
         return jsonify({'success': result})
+    except (ContentNotFoundError, ValueError):
+        raise
     except Exception as e:
         return jsonify({'error': f'Error restoring content: {str(e)}'}), 500
 
@@ -213,10 +282,10 @@ def list_content(content_type: str):
     Query parameters:
     - page: Page number (default: 1)
     - per_page: Items per page (default: 20, max: 100)
-    - tags: Comma-separated list of tags to filter by
+    - tags: Comma-separated list of tags to filter by (at most MAX_FILTER_TAGS)
     - from_date: ISO date to filter from (inclusive)
     - to_date: ISO date to filter to (inclusive)
-    - sort_by: Field to sort by (default: 'created_at')
+    - sort_by: Field to sort by (default: 'created_at'; must be 'created_at' with date filters)
     - sort_order: 'asc' or 'desc' (default: 'desc')
     """
     try:
@@ -231,12 +300,20 @@ def list_content(content_type: str):
         sort_by = request.args.get('sort_by', 'created_at')
         sort_order = request.args.get('sort_order', 'desc')
         
+        # Firestore must order by the field a range filter applies to
+        if (from_date or to_date) and sort_by != 'created_at':
+            return jsonify({'error': "Date filters can only be combined with sort_by 'created_at'"}), 400
+        
         # Build filter conditions
         filters = []
         
         # Tag filter
         if tags:
-            filters.append(('tags', 'array_contains_any', [t.strip() for t in tags if t.strip()]))
+            tag_list = list(dict.fromkeys(t.strip() for t in tags if t.strip()))
+            if len(tag_list) > MAX_FILTER_TAGS:
+                return jsonify({'error': f'At most {MAX_FILTER_TAGS} tags can be filtered by'}), 400
+            if tag_list:
+                filters.append(('tags', 'array_contains_any', tag_list))
         
         # Date range filters
         if from_date:
@@ -245,7 +322,7 @@ def list_content(content_type: str):
             filters.append(('created_at', '<=', to_date))
         
         # Create manager and get paginated results
-        manager = ContentManager(content_type=content_type)
+        manager = _get_manager(content_type)
         results = manager.list_content(
             page=page,
             per_page=per_page,
@@ -254,7 +331,7 @@ def list_content(content_type: str):
             sort_order=sort_order
         )
         
-        return jsonify(results)
+        return _ojson(results)
         
     except ValueError as e:
         return jsonify({'error': str(e)}), 400
@@ -274,23 +351,25 @@ def get_all_content_tags():
     """
     try:
         include_deleted = request.args.get('include_deleted') == 'true'
-        result = {
-            'by_type': {},
-            'all_tags': set()
-        }
         
-        # Iterate through defined content types
-        for content_type in CONTENT_TYPES.keys():
-            manager = ContentManager(content_type=content_type)
-            type_tags = manager.get_available_tags()
-            
-            result['by_type'][content_type] = type_tags
-            result['all_tags'].update(type_tags)
+        # Query each content type's tags concurrently
+        with ThreadPoolExecutor(max_workers=len(CONTENT_TYPES)) as executor:
+            futures = {
+                content_type: executor.submit(_get_manager(content_type).get_available_tags, include_deleted)
+                for content_type in CONTENT_TYPES
+            }
+            by_type = {content_type: future.result() for content_type, future in futures.items()}
         
-        # Convert set to sorted list for JSON serialization
-        result['all_tags'] = sorted(list(result['all_tags']))
+        # Each type's tags are already sorted, so merge them and skip duplicates
+        all_tags = []
+        for tag in heapq.merge(*by_type.values()):
+            if not all_tags or tag != all_tags[-1]:
+                all_tags.append(tag)
         
-        return jsonify(result)
+        return _ojson({
+            'by_type': by_type,
+            'all_tags': all_tags
+        })
         
     except Exception as e:
         return jsonify({'error': f'Error retrieving tags: {str(e)}'}), 500
@@ -309,10 +388,10 @@ def get_content_type_tags(content_type: str):
     try:
         include_deleted = request.args.get('include_deleted') == 'true'
         
-        manager = ContentManager(content_type=content_type)
-        tags = manager.get_available_tags()
+        manager = _get_manager(content_type)
+        tags = manager.get_available_tags(include_deleted)
         
-        return jsonify({
+        return _ojson({
             'content_type': content_type,
             'tags': tags
         })
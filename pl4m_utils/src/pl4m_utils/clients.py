@@ -0,0 +1,66 @@
+"""
+Shared Google Cloud clients for PL4M utilities.
+
+Every manager in the process uses the same storage and Firestore clients so
+that connections, credentials and auth tokens are set up once and reused,
+including when managers are used from multiple threads.
+"""
+from functools import lru_cache
+import os
+
+import google.auth
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import firestore, storage
+from requests.adapters import HTTPAdapter
+
+# Connections kept open to GCS per process; sized for concurrent uploads
+HTTP_POOL_SIZE = 32
+
+@lru_cache(maxsize=1)
+def get_storage_client() -> storage.Client:
+    """
+    Get the process-wide GCS client, creating it on first use.
+    
+    The client is given its own authorized HTTP session with a larger
+    connection pool, so concurrent uploads reuse connections instead of
+    opening new ones.
+    
+    Returns:
+        The shared storage client
+    """
+    credentials, _ = google.auth.default(scopes=storage.Client.SCOPE)
+    session = AuthorizedSession(credentials)
+    session.mount("https://", HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE))
+    return storage.Client(credentials=credentials, _http=session)
+
+@lru_cache(maxsize=1)
+def get_firestore_client() -> firestore.Client:
+    """
+    Get the process-wide Firestore client.
+    
+    Returns:
+        The shared Firestore client
+    """
+    return firestore.Client()
+
+@lru_cache(maxsize=1)
+def get_async_firestore_client() -> firestore.AsyncClient:
+    """
+    Get the process-wide async Firestore client.
+    
+    The client's gRPC channel is bound to the event loop that first uses it,
+    so async managers should be driven from a single long-lived loop.
+    
+    Returns:
+        The shared async Firestore client
+    """
+    return firestore.AsyncClient()
+
+def _reset_clients() -> None:
+    """Drop the clients inherited from the parent, so a forked child creates its own."""
+    get_storage_client.cache_clear()
+    get_firestore_client.cache_clear()
+    get_async_firestore_client.cache_clear()
+
+# A forked worker must not share the parent's HTTP session or gRPC channels
+os.register_at_fork(after_in_child=_reset_clients)
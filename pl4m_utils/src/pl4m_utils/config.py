@@ -2,9 +2,12 @@
 Configuration settings for PL4M utilities.
 
 This module contains default configuration settings for bucket names, Firestore
-collections, and content type definitions. Users can override these settings
-by importing and modifying the values directly or by setting environment variables.
+collections, and content type definitions. Bucket and collection names can be
+overridden by setting environment variables. Content type definitions are frozen
+at import time and are read-only.
 """
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, Set, Any, List
 
 # Default GCS bucket configuration - single bucket for all content
@@ -45,10 +48,53 @@ CONTENT_TYPES = {
     }
 }
 
+def _freeze_content_type(config: Dict[str, Any]) -> MappingProxyType:
+    """Return a read-only copy of a content type definition."""
+    frozen = dict(config)
+    frozen['valid_extensions'] = frozenset(config['valid_extensions'])
+    frozen['required_metadata'] = frozenset(config['required_metadata'])
+    frozen['optional_metadata'] = frozenset(config.get('optional_metadata', ()))
+    if 'mime_types' in config:
+        frozen['mime_types'] = MappingProxyType(config['mime_types'])
+    return MappingProxyType(frozen)
+
+# Shared by every ContentManager, so guard against accidental mutation
+CONTENT_TYPES = MappingProxyType({
+    type_name: _freeze_content_type(config)
+    for type_name, config in CONTENT_TYPES.items()
+})
+
+# JSON-serializable view of CONTENT_TYPES, as returned by the content types endpoint
+CONTENT_TYPES_VIEW = {
+    'content_types': {
+        type_name: {
+            'valid_extensions': sorted(config['valid_extensions']),
+            'required_metadata': sorted(config['required_metadata']),
+            'optional_metadata': sorted(config.get('optional_metadata', [])),
+        }
+        for type_name, config in CONTENT_TYPES.items()
+    }
+}
+
+# MIME types keyed by (content_type, extension without dot), with each
+# content type's default MIME type used for extensions it has no mapping for
+_DEFAULT_MIME = {
+    type_name: config.get('default_content_type', 'application/octet-stream')
+    for type_name, config in CONTENT_TYPES.items()
+}
+_EXT_MIME = {
+    (type_name, ext.lstrip('.')): config.get('mime_types', {}).get(ext.lstrip('.'), _DEFAULT_MIME[type_name])
+    for type_name, config in CONTENT_TYPES.items()
+    for ext in config['valid_extensions'] | config.get('mime_types', {}).keys()
+}
+
+@lru_cache(maxsize=None)
 def get_bucket_name() -> str:
     """
     Get the configured bucket name.
     
+    The result is cached, so the environment override is read once per process.
+    
     Returns:
         The configured bucket name
     """
@@ -56,6 +102,7 @@ def get_bucket_name() -> str:
     env_var = "PL4M_BUCKET"
     return os.environ.get(env_var, DEFAULT_GCS_BUCKET)
 
+@lru_cache(maxsize=None)
 def get_content_type_config(content_type: str) -> Dict[str, Any]:
     """
     Get the configuration for a specific content type.
@@ -73,10 +120,14 @@ def get_content_type_config(content_type: str) -> Dict[str, Any]:
         raise ValueError(f"Undefined content type: {content_type}")
     return CONTENT_TYPES[content_type]
 
+@lru_cache(maxsize=None)
 def get_collection_name(content_type: str) -> str:
     """
     Get the configured collection name for a given content type.
     
+    The result is cached per content type, so environment overrides are read
+    once per process.
+    
     Args:
         content_type: Type of content (e.g., 'documents', 'images', 'blog')
         
@@ -97,6 +148,10 @@ def get_collection_name(content_type: str) -> str:
     # Finally, use the default collection
     return DEFAULT_COLLECTION
 
+def _ext_of(filename: str) -> str:
+    """Return the lowercased extension of a filename, without the dot."""
+    return filename.rpartition('.')[2].lower()
+
 def get_mime_type(content_type: str, filename: str) -> str:
     """
     Determine MIME type for a file based on its extension and content type.
@@ -107,18 +162,13 @@ def get_mime_type(content_type: str, filename: str) -> str:
         
     Returns:
         MIME type string
+        
+    Raises:
+        ValueError: If content type is not defined
     """
-    config = get_content_type_config(content_type)
-    
-    # Use content type's default if available
-    if "default_content_type" in config:
-        default_type = config["default_content_type"]
-    else:
-        default_type = "application/octet-stream"
-    
-    # If there's a mime_types mapping, use it
-    if "mime_types" in config:
-        ext = filename.lower().split('.')[-1]
-        return config["mime_types"].get(ext, default_type)
-    
-    return default_type 
\ No newline at end of file
+    mime_type = _EXT_MIME.get((content_type, _ext_of(filename)))
+    if mime_type is not None:
+        return mime_type
+    if content_type not in _DEFAULT_MIME:
+        raise ValueError(f"Undefined content type: {content_type}")
+    return _DEFAULT_MIME[content_type]
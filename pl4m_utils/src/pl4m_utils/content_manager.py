@@ -1,17 +1,83 @@
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List, Set, Union
-from pl4m_utils.metadata_manager import MetadataManager, MetadataManagerError
+from cachetools import TTLCache
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, IO, Iterator, List, Set, Tuple, Union
+from pl4m_utils.metadata_manager import (
+    AsyncMetadataManager, MetadataManager, MetadataManagerError, NotFoundError
+)
+from pl4m_utils.clients import get_storage_client
 from pl4m_utils.config import (
     get_bucket_name, get_content_type_config, 
     get_collection_name, get_mime_type
 )
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
+from google.cloud.storage import transfer_manager
 from urllib.parse import urlparse
+import io
+import os
+import threading
+import weakref
+
+# Payloads larger than this are sent as a chunked resumable upload
+CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024
+
+# Files on disk larger than this are uploaded as concurrent multipart chunks
+CONCURRENT_UPLOAD_THRESHOLD = 50 * 1024 * 1024
+CONCURRENT_UPLOAD_WORKERS = 8
+
+# Blobs larger than this are downloaded as concurrent byte ranges; the number
+# of ranges in flight is bounded to keep worker memory flat
+CONCURRENT_DOWNLOAD_THRESHOLD = 32 * 1024 * 1024
+CONCURRENT_DOWNLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+CONCURRENT_DOWNLOAD_WORKERS = 4
+
+# Most values Firestore accepts in a single array_contains_any filter
+ARRAY_CONTAINS_ANY_LIMIT = 10
+
+# Runs the per-chunk queries of oversized array_contains_any filters. Kept
+# apart from MetadataManager's pool: its jobs never wait on this pool, so
+# concurrent split listings cannot deadlock it
+_SPLIT_QUERY_EXECUTOR = ThreadPoolExecutor(max_workers=16)
+
+# Live managers, so a forked child can drop the bucket handles they cached
+_MANAGERS = weakref.WeakSet()
+
+def _reset_bucket_refs() -> None:
+    """Drop bucket handles bound to the parent's storage client after a fork."""
+    for manager in list(_MANAGERS):
+        manager._bucket_ref = None
+
+os.register_at_fork(after_in_child=_reset_bucket_refs)
+
+# Upper bound on concurrent requests when generating many upload URLs
+UPLOAD_URL_MAX_WORKERS = 32
+
+# Distinct tags per collection, keyed by (collection, include_deleted)
+_TAG_CACHE = TTLCache(maxsize=64, ttl=60)
+_TAG_CACHE_LOCK = threading.Lock()
+
+# Expected types for common metadata fields
+_TYPE_VALIDATIONS = {
+    'tags': (list, set),
+    'taken_at': datetime,
+    'publish_date': datetime,
+    'created_date': datetime
+}
+
+def _now() -> datetime:
+    """Return the current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
 
 class ContentManagerError(Exception):
     """Base exception for content management errors."""
     pass
 
+class ContentNotFoundError(ContentManagerError):
+    """Raised when the requested content does not exist."""
+    pass
+
 class ContentManager:
     """
     Unified manager for GCS-stored content with Firestore metadata.
@@ -24,7 +90,8 @@ class ContentManager:
     - Content type-specific configurations
     """
     
-    storage_client = storage.Client()
+    # Record fields that are managed by the system and cannot be updated
+    PROTECTED_FIELDS = frozenset({'gcs_path', 'bucket', 'blob_path', 'id', 'created_at', 'content_type'})
 
     def __init__(self, content_type: str):
         """Initialize content manager for a specific content type."""
@@ -35,7 +102,25 @@ class ContentManager:
         self.valid_extensions = self.config["valid_extensions"]
         self.required_metadata = self.config["required_metadata"]
         self.optional_metadata = self.config.get("optional_metadata", set())
+        self._required_fields = frozenset(f for f in self.required_metadata if f != 'last_modified')
+        self._allowed_fields = self._required_fields | frozenset(self.optional_metadata)
         self.metadata_manager = MetadataManager()
+        self.async_metadata_manager = AsyncMetadataManager()
+        self._bucket_ref = None
+        self._gcs_prefix = f"gs://{self.bucket}/"
+        _MANAGERS.add(self)
+
+    @property
+    def storage_client(self) -> storage.Client:
+        """The process-wide GCS client."""
+        return get_storage_client()
+
+    @property
+    def bucket_ref(self) -> storage.Bucket:
+        """Handle for this manager's bucket, resolved on first use."""
+        if self._bucket_ref is None:
+            self._bucket_ref = self.storage_client.bucket(self.bucket)
+        return self._bucket_ref
 
     @staticmethod
     def _parse_gcs_path(gcs_path: str) -> tuple[str, str]:
@@ -52,9 +137,76 @@ class ContentManager:
             
         return bucket_name, blob_path
 
+    def get_blob(self, blob_path: str, bucket_name: Optional[str] = None) -> storage.Blob:
+        """Get a blob handle, reusing the cached bucket when it is this manager's bucket."""
+        if bucket_name is None or bucket_name == self.bucket:
+            return self.bucket_ref.blob(blob_path)
+        return self.storage_client.bucket(bucket_name).blob(blob_path)
+
+    @staticmethod
+    def iter_blob_ranges(blob: storage.Blob,
+                         chunk_size: int = CONCURRENT_DOWNLOAD_CHUNK_SIZE,
+                         max_workers: int = CONCURRENT_DOWNLOAD_WORKERS) -> Iterator[bytes]:
+        """
+        Download a blob as concurrent byte ranges, yielding them in order.
+        
+        At most max_workers ranges are fetched or buffered at a time. Every
+        range is pinned to the blob's current generation, so a concurrent
+        overwrite fails the download instead of mixing two versions. The blob
+        must have been loaded (e.g. via reload()) so its size is known.
+        """
+        starts = iter(range(0, blob.size, chunk_size))
+        
+        def fetch(start: int) -> bytes:
+            return blob.download_as_bytes(
+                start=start,
+                end=min(start + chunk_size, blob.size) - 1,
+                if_generation_match=blob.generation
+            )
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque(executor.submit(fetch, start) for _, start in zip(range(max_workers), starts))
+            while pending:
+                data = pending.popleft().result()
+                next_start = next(starts, None)
+                if next_start is not None:
+                    pending.append(executor.submit(fetch, next_start))
+                yield data
+
+    @staticmethod
+    def _upload_to_blob(blob: storage.Blob, content: Union[bytes, IO[bytes]], content_type: str) -> int:
+        """
+        Upload bytes or a binary file object to a blob and return the uploaded size.
+        
+        File objects are streamed rather than read into memory. Payloads above
+        CHUNKED_UPLOAD_THRESHOLD use a chunked resumable upload, and files on
+        disk above CONCURRENT_UPLOAD_THRESHOLD are uploaded as concurrent parts.
+        """
+        if isinstance(content, bytes):
+            content = io.BytesIO(content)
+        
+        content.seek(0, io.SEEK_END)
+        size = content.tell()
+        content.seek(0)
+        
+        file_path = getattr(content, 'name', None)
+        if size > CONCURRENT_UPLOAD_THRESHOLD and isinstance(file_path, str) and os.path.isfile(file_path):
+            transfer_manager.upload_chunks_concurrently(
+                file_path, blob,
+                content_type=content_type,
+                max_workers=CONCURRENT_UPLOAD_WORKERS,
+                worker_type=transfer_manager.THREAD
+            )
+            return size
+        
+        if size > CHUNKED_UPLOAD_THRESHOLD:
+            blob.chunk_size = CHUNKED_UPLOAD_THRESHOLD
+        blob.upload_from_file(content, size=size, content_type=content_type, rewind=True)
+        return size
+
     def _validate_extension(self, filename: str) -> None:
         """Validate file extension against allowed types."""
-        ext = f".{filename.lower().split('.')[-1]}"
+        ext = '.' + filename.rpartition('.')[2].lower()
         if ext not in self.valid_extensions:
             raise ValueError(f"Invalid file extension: {ext}. Allowed: {self.valid_extensions}")
 
@@ -63,25 +215,16 @@ class ContentManager:
         if not isinstance(metadata, dict):
             raise ValueError("Metadata must be a dictionary")
         
-        required_fields = {field for field in self.required_metadata 
-                         if field != 'last_modified'}
-        missing_fields = required_fields - metadata.keys()
+        keys = metadata.keys()
+        missing_fields = self._required_fields - keys
         if missing_fields:
-            raise ValueError(f"Missing required metadata fields: {missing_fields}")
+            raise ValueError(f"Missing required metadata fields: {set(missing_fields)}")
             
-        invalid_fields = set(metadata.keys()) - (required_fields | self.optional_metadata)
+        invalid_fields = keys - self._allowed_fields
         if invalid_fields:
             raise ValueError(f"Invalid metadata fields: {invalid_fields}")
 
-        # Type validations for common fields
-        type_validations = {
-            'tags': (list, set),
-            'taken_at': datetime,
-            'publish_date': datetime,
-            'created_date': datetime
-        }
-        
-        for field, expected_type in type_validations.items():
+        for field, expected_type in _TYPE_VALIDATIONS.items():
             if field in metadata and not isinstance(metadata[field], expected_type):
                 raise ValueError(f"'{field}' must be of type {expected_type}")
 
@@ -89,19 +232,24 @@ class ContentManager:
         """Generate path structure: {YYYY}/{MM}/{DD}/{content_type}/{filename}"""
         if not filename or '/' in filename:
             raise ValueError("Invalid filename")
-        target_date = date or datetime.utcnow()
+        target_date = date or _now()
         return f"{target_date.year:04d}/{target_date.month:02d}/{target_date.day:02d}/{self.content_type}/{filename}"
 
+    def _prepare_upload(self, filename: str, metadata: Optional[Dict[str, Any]] = None,
+                        date: Optional[datetime] = None) -> Tuple[str, storage.Blob, str]:
+        """Validate an upload and resolve its (file_path, blob, content_type)."""
+        self._validate_extension(filename)
+        if metadata is not None:
+            self._validate_metadata(metadata)
+        
+        file_path = self._generate_file_path(filename, date)
+        return file_path, self.get_blob(file_path), get_mime_type(self.content_type, filename)
+
     def generate_upload_url(self, filename: str, date: Optional[datetime] = None, 
                           allow_overwrite: bool = False) -> str:
         """Generate signed upload URL for GCS."""
         try:
-            self._validate_extension(filename)
-            file_path = self._generate_file_path(filename, date)
-            content_type = get_mime_type(self.content_type, filename)
-            
-            bucket = self.storage_client.bucket(self.bucket)
-            blob = bucket.blob(file_path)
+            file_path, blob, content_type = self._prepare_upload(filename, date=date)
             
             if not allow_overwrite and blob.exists():
                 raise ValueError(f"File already exists at path: {file_path}")
@@ -115,6 +263,19 @@ class ContentManager:
         except Exception as e:
             raise ContentManagerError(f"Failed to generate upload URL: {str(e)}")
 
+    def generate_upload_urls(self, filenames: List[str], date: Optional[datetime] = None,
+                             allow_overwrite: bool = False) -> Dict[str, str]:
+        """Generate signed upload URLs for many files concurrently, keyed by filename."""
+        if not filenames:
+            return {}
+        
+        with ThreadPoolExecutor(max_workers=min(UPLOAD_URL_MAX_WORKERS, len(filenames))) as executor:
+            urls = executor.map(
+                lambda filename: self.generate_upload_url(filename, date, allow_overwrite),
+                filenames
+            )
+            return dict(zip(filenames, urls))
+
     def get_content(self, content_id: str, include_deleted: bool = False) -> Optional[Dict[str, Any]]:
         """Get content metadata by ID."""
         try:
@@ -129,6 +290,13 @@ class ContentManager:
         try:
             filter_dicts = [{'field': f, 'op': o, 'value': v} for f, o, v in (filters or [])]
             
+            oversized = next((f for f in filter_dicts if f['op'] == 'array_contains_any'
+                              and len(f['value']) > ARRAY_CONTAINS_ANY_LIMIT), None)
+            if oversized:
+                return self._list_content_split(
+                    filter_dicts, oversized, sort_by, sort_order.lower() == 'desc', page, per_page
+                )
+            
             return self.metadata_manager.list_documents(
                 collection=self.collection,
                 include_deleted=False,
@@ -146,128 +314,312 @@ class ContentManager:
 
             raise ContentManagerError(f"Failed to list content: {str(e)}")
 
-    def update_content(self, content_id: str, new_content: Union[str, bytes]) -> Dict[str, Any]:
+    def _list_content_split(self, filter_dicts: List[Dict[str, Any]], split_filter: Dict[str, Any],
+                            sort_by: str, descending: bool, page: int, per_page: int) -> Dict[str, Any]:
+        """
+        Run an array_contains_any filter with more values than Firestore allows
+        as parallel queries of at most ARRAY_CONTAINS_ANY_LIMIT values each,
+        then merge, sort and paginate the combined results.
+        
+        Each query fetches only up to the end of the requested page. The total
+        counts distinct documents: when a query reaches that limit, the IDs of
+        all its matches are fetched too, so a document matching values in
+        several queries is counted once.
+        """
+        values = list(split_filter['value'])
+        other_filters = [f for f in filter_dicts if f is not split_filter]
+        chunk_filters = [other_filters + [{**split_filter, 'value': values[i:i + ARRAY_CONTAINS_ANY_LIMIT]}]
+                         for i in range(0, len(values), ARRAY_CONTAINS_ANY_LIMIT)]
+        window = page * per_page
+        
+        list_futures = [
+            _SPLIT_QUERY_EXECUTOR.submit(self.metadata_manager.list_documents, self.collection,
+                                         order_by=sort_by, descending=descending, filters=filters,
+                                         limit=window, include_total=False)
+            for filters in chunk_filters
+        ]
+        results = [future.result()['items'] for future in list_futures]
+        
+        # A document matching several chunks is returned once
+        merged = {}
+        for items in results:
+            for item in items:
+                merged.setdefault(item['id'], item)
+        
+        items = sorted(merged.values(), key=lambda item: (item.get(sort_by), item['id']), reverse=descending)
+        
+        # Chunks cut off at the window may match more documents; fetching only
+        # their sort field is enough to count the distinct matches
+        id_futures = [
+            _SPLIT_QUERY_EXECUTOR.submit(self.metadata_manager.list_documents, self.collection,
+                                         order_by=sort_by, descending=descending, filters=filters,
+                                         fields=[], include_total=False)
+            for filters, chunk_items in zip(chunk_filters, results) if len(chunk_items) == window
+        ]
+        matched_ids = set(merged)
+        for future in id_futures:
+            matched_ids.update(item['id'] for item in future.result()['items'])
+        total_items = len(matched_ids)
+        
+        page_items = items[window - per_page:window]
+        next_cursor = None
+        if len(page_items) == per_page:
+            next_cursor = {sort_by: page_items[-1].get(sort_by), 'id': page_items[-1]['id']}
+        
+        return {
+            'items': page_items,
+            'total': total_items,
+            'page': page,
+            'per_page': per_page,
+            'pages': (total_items + per_page - 1) // per_page,
+            'next_cursor': next_cursor
+        }
+
+    async def list_content_async(self, page: int = 1, per_page: int = 20,
+                                 filters: Optional[List[tuple]] = None,
+                                 sort_by: str = 'created_at', sort_order: str = 'desc') -> Dict[str, Any]:
+        """List content like list_content, counting and fetching the page concurrently."""
+        try:
+            filter_dicts = [{'field': f, 'op': o, 'value': v} for f, o, v in (filters or [])]
+            
+            return await self.async_metadata_manager.list_documents(
+                collection=self.collection,
+                include_deleted=False,
+                order_by=sort_by,
+                descending=sort_order.lower() == 'desc',
+                filters=filter_dicts,
+                page=page,
+                per_page=per_page
+            )
+        except MetadataManagerError as e:
+            raise ContentManagerError(f"Failed to list content: {str(e)}")
+
+    def update_content(self, content_id: str, new_content: Union[str, bytes, IO[bytes]]) -> Dict[str, Any]:
         """Update the content of a GCS file and its metadata."""
         try:
             content = self.get_content(content_id)
             if not content:
-                raise ValueError(f"Content {content_id} not found")
+                raise ContentNotFoundError(f"Content {content_id} not found")
 
             content_type = content.get('content_type') or get_mime_type(
-                self.content_type, content['blob_path'].split('/')[-1]
+                self.content_type, content['blob_path'].rpartition('/')[2]
             )
 
-            bucket = self.storage_client.bucket(content['bucket'])
-            blob = bucket.blob(content['blob_path'])
+            blob = self.get_blob(content['blob_path'], content['bucket'])
             
             if isinstance(new_content, str):
                 new_content = new_content.encode('utf-8')
             
-            blob.upload_from_string(new_content, content_type=content_type)
+            size = self._upload_to_blob(blob, new_content, content_type)
             
-            updates = {'size_bytes': len(new_content)}
+            updates = {'size_bytes': size}
             if 'last_modified' in self.required_metadata:
-                updates['last_modified'] = datetime.utcnow()
+                updates['last_modified'] = _now()
             
-            return self.metadata_manager.update_document(self.collection, content_id, updates)
+            return self.metadata_manager.update_document(self.collection, content_id, updates,
+                                                         return_server_state=True)
+        except ContentNotFoundError:
+            raise
+        except NotFoundError:
+            raise ContentNotFoundError(f"Content {content_id} not found")
         except Exception as e:
             raise ContentManagerError(f"Failed to update content: {str(e)}")
 
     def update_metadata(self, content_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update content metadata."""
         try:
-            protected_fields = {'gcs_path', 'bucket', 'blob_path', 'id', 'created_at', 'content_type'}
-            invalid_fields = protected_fields.intersection(updates.keys())
+            invalid_fields = updates.keys() & self.PROTECTED_FIELDS
             if invalid_fields:
                 raise ValueError(f"Cannot update protected fields: {invalid_fields}")
             
             update_data = updates.copy()
             if 'last_modified' in self.required_metadata:
-                update_data['last_modified'] = datetime.utcnow()
+                update_data['last_modified'] = _now()
             
-            return self.metadata_manager.update_document(self.collection, content_id, update_data)
+            result = self.metadata_manager.update_document(self.collection, content_id, update_data,
+                                                           return_server_state=True)
+            if 'tags' in updates:
+                self._invalidate_tags()
+            return result
+        except NotFoundError:
+            raise ContentNotFoundError(f"Content {content_id} not found")
         except MetadataManagerError as e:
             raise ContentManagerError(f"Failed to update metadata: {str(e)}")
 
-    def upload_new_content(self, filename: str, content: Union[str, bytes], 
-                         metadata: Dict[str, Any], date: Optional[datetime] = None,
-                         creation_date: Optional[datetime] = None) -> Dict[str, Any]:
-        """Upload new content with metadata in one operation."""
-        try:
-            self._validate_extension(filename)
-            self._validate_metadata(metadata)
-            
-            file_path = self._generate_file_path(filename, date)
-            content_type = get_mime_type(self.content_type, filename)
+    def _upload_file(self, filename: str, content: Union[str, bytes, IO[bytes]],
+                     metadata: Dict[str, Any], date: Optional[datetime] = None) -> Dict[str, Any]:
+        """Validate and upload content to GCS, returning its record data."""
+        file_path, blob, content_type = self._prepare_upload(filename, metadata, date)
+        
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        
+        size = self._upload_to_blob(blob, content, content_type)
+        
+        content_data = {
+            **metadata,
+            'gcs_path': self._gcs_prefix + file_path,
+            'bucket': self.bucket,
+            'blob_path': file_path,
+            'size_bytes': size,
+            'content_type': content_type
+        }
+        
+        if 'last_modified' in self.required_metadata:
+            content_data['last_modified'] = _now()
+        
+        return content_data
+
+    def upload_file(self, filename: str, content: Union[str, bytes, IO[bytes]],
+                    metadata: Dict[str, Any], date: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Upload content to GCS without creating its metadata record.
+        
+        Use together with create_content_records to upload many files
+        concurrently and then store their metadata in one bulk write.
+        
+        Returns:
+            Dict[str, Any]: Record data for the uploaded content
             
-            if isinstance(content, str):
-                content = content.encode('utf-8')
+        Raises:
+            ContentManagerError: If validation or upload fails
+        """
+        try:
+            return self._upload_file(filename, content, metadata, date)
+        except Exception as e:
+            raise ContentManagerError(f"Failed to upload file: {str(e)}")
+
+    def create_content_records(self, records: List[Dict[str, Any]],
+                               creation_dates: Optional[List[Optional[datetime]]] = None) -> List[Dict[str, Any]]:
+        """
+        Store metadata records for previously uploaded content in bulk.
+        
+        Args:
+            records: Record data as returned by upload_file
+            creation_dates: Optional creation timestamps, one per record
             
-            bucket = self.storage_client.bucket(self.bucket)
-            blob = bucket.blob(file_path)
-            blob.upload_from_string(content, content_type=content_type)
+        Returns:
+            List[Dict[str, Any]]: Created content metadata, in the same order as records
             
-            content_data = metadata.copy()
-            content_data.update({
-                'gcs_path': f"gs://{self.bucket}/{file_path}",
-                'bucket': self.bucket,
-                'blob_path': file_path,
-                'size_bytes': len(content),
-                'content_type': content_type
-            })
+        Raises:
+            ContentManagerError: If any record cannot be created
+        """
+        try:
+            custom_timestamps = None
+            if creation_dates:
+                custom_timestamps = [{'created_at': d} if d else None for d in creation_dates]
             
-            if 'last_modified' in self.required_metadata:
-                content_data['last_modified'] = datetime.utcnow()
+            created = self.metadata_manager.create_documents_bulk(
+                self.collection,
+                records,
+                custom_timestamps=custom_timestamps
+            )
+            self._invalidate_tags()
+            return created
+        except Exception as e:
+            raise ContentManagerError(f"Failed to create content records: {str(e)}")
+
+    def upload_new_content(self, filename: str, content: Union[str, bytes, IO[bytes]], 
+                         metadata: Dict[str, Any], date: Optional[datetime] = None,
+                         creation_date: Optional[datetime] = None,
+                         content_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Upload new content with metadata in one operation.
+        
+        Pass content_id to make the call safe to retry: a second attempt with
+        the same ID fails instead of creating a duplicate record.
+        """
+        try:
+            content_data = self._upload_file(filename, content, metadata, date)
             
             custom_timestamps = {'created_at': creation_date} if creation_date else None
             
-            return self.metadata_manager.create_document(
+            created = self.metadata_manager.create_document(
                 self.collection, 
                 content_data,
-                custom_timestamps=custom_timestamps
+                custom_timestamps=custom_timestamps,
+                doc_id=content_id
             )
+            if 'tags' in metadata:
+                self._invalidate_tags()
+            return created
         except Exception as e:
             raise ContentManagerError(f"Failed to upload new content: {str(e)}")
 
     def delete_content(self, content_id: str, hard_delete: bool = False) -> bool:
         """Delete content record and optionally its GCS file."""
         try:
-            content = self.get_content(content_id, include_deleted=True)
-            if not content:
-                raise ValueError(f"Content {content_id} not found")
-
             if hard_delete:
-                bucket = self.storage_client.bucket(content['bucket'])
-                blob = bucket.blob(content['blob_path'])
-                if blob.exists():
+                # The record is only read when its GCS file must be removed too
+                content = self.get_content(content_id, include_deleted=True)
+                if not content:
+                    raise ContentNotFoundError(f"Content {content_id} not found")
+                
+                blob = self.get_blob(content['blob_path'], content['bucket'])
+                try:
                     blob.delete()
-                return self.metadata_manager.hard_delete_document(self.collection, content_id)
+                except NotFound:
+                    pass  # File already removed; still delete the record
+                result = self.metadata_manager.hard_delete_document(self.collection, content_id)
             else:
-                return self.metadata_manager.soft_delete(self.collection, content_id)
+                result = self.metadata_manager.soft_delete(self.collection, content_id)
+            
+            self._invalidate_tags()
+            return result
+        except (ContentNotFoundError, ValueError):
+            raise
+        except NotFoundError:
+            raise ContentNotFoundError(f"Content {content_id} not found")
         except Exception as e:
             raise ContentManagerError(f"Failed to delete content: {str(e)}")
 
     def restore_content(self, content_id: str) -> bool:
         """Restore a soft-deleted content record."""
         try:
-            return self.metadata_manager.restore_document(self.collection, content_id)
+            result = self.metadata_manager.restore_document(self.collection, content_id)
+            self._invalidate_tags()
+            return result
+        except NotFoundError:
+            raise ContentNotFoundError(f"Content {content_id} not found")
         except MetadataManagerError as e:
             raise ContentManagerError(f"Failed to restore content: {str(e)}")
 
-    def get_available_tags(self) -> List[str]:
+    def _invalidate_tags(self) -> None:
+        """Drop this collection's cached tag lists after tags may have changed."""
+        with _TAG_CACHE_LOCK:
+            _TAG_CACHE.pop((self.collection, False), None)
+            _TAG_CACHE.pop((self.collection, True), None)
+
+    def get_available_tags(self, include_deleted: bool = False) -> List[str]:
         """
-        Get a list of all unique tags used in the collection from non-deleted documents.
+        Get a list of all unique tags used in the collection.
         
+        Results are cached for up to a minute; writes made through this
+        manager that touch tags invalidate the cache immediately.
+        
+        Args:
+            include_deleted: Whether to include tags from soft-deleted documents
+            
         Returns:
             List[str]: Sorted list of unique tags
             
         Raises:
             ContentManagerError: If tag retrieval fails
         """
+        key = (self.collection, include_deleted)
+        with _TAG_CACHE_LOCK:
+            tags = _TAG_CACHE.get(key)
+        if tags is not None:
+            return list(tags)
+        
         try:
-            return self.metadata_manager.get_distinct_tags(self.collection, include_deleted=False)
+            tags = self.metadata_manager.get_distinct_tags(self.collection, include_deleted=include_deleted)
         except MetadataManagerError as e:
             raise ContentManagerError(f"Failed to get available tags: {str(e)}")
+        
+        with _TAG_CACHE_LOCK:
+            _TAG_CACHE[key] = tags
+        return list(tags)
 
     def update_content_tags(self, content_id: str, tags: List[str], operation: str = 'set') -> Dict[str, Any]:
         """
@@ -282,14 +634,14 @@ class ContentManager:
             Dict[str, Any]: Updated content metadata
             
         Raises:
+            ContentNotFoundError: If content doesn't exist
             ContentManagerError: If tag update fails
-            ValueError: If operation is invalid or content not found
         """
         try:
             # Verify content exists and get current tags
             content = self.get_content(content_id)
             if not content:
-                raise ValueError(f"Content {content_id} not found")
+                raise ContentNotFoundError(f"Content {content_id} not found")
             
             current_tags = set(content.get('tags', []))
             
@@ -306,6 +658,8 @@ class ContentManager:
             # Update the content with new tags
             return self.update_metadata(content_id, {'tags': sorted(list(new_tags))})
             
+        except ContentNotFoundError:
+            raise
         except Exception as e:
             raise ContentManagerError(f"Failed to update tags: {str(e)}")
 
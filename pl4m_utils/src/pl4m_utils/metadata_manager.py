@@ -1,25 +1,320 @@
+from cachetools import LRUCache
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from google.api_core.exceptions import (
+    Aborted, AlreadyExists, DeadlineExceeded, FailedPrecondition, NotFound, ResourceExhausted,
+    ServiceUnavailable
+)
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from google.cloud.firestore_v1.transforms import ArrayRemove, ArrayUnion, Increment, Maximum, Minimum, Sentinel
+from typing import Callable, Optional, List, Dict, Any, Iterable, Set, Tuple
+from datetime import datetime, timezone
+from functools import lru_cache
+import asyncio
+import heapq
+from itertools import islice
+import orjson
+import os
+import threading
+import time
+from urllib.parse import quote
+from pl4m_utils.clients import get_async_firestore_client, get_firestore_client
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+
+__all__ = [
+    'MetadataManager', 'AsyncMetadataManager', 'MetadataManagerError',
+    'NotFoundError', 'AlreadyExistsError', 'RetryableError'
+]
+
+# Documents read with ttl_seconds, keyed by (collection, document_id), as (monotonic read time, data)
+_READ_CACHE = LRUCache(maxsize=10_000)
+_READ_CACHE_LOCK = threading.Lock()
+
+# Attempts per write before a BulkWriter failure is reported
+BULK_WRITE_MAX_ATTEMPTS = 5
+
+# Writes per WriteBatch (Firestore allows up to 500); batches commit concurrently
+BATCH_WRITE_SIZE = 50
+
+# Shared pool for overlapping independent Firestore round trips
+_EXECUTOR = ThreadPoolExecutor(max_workers=40)
+
+# Suffix of the collection holding per-tag document counts for a collection
+TAG_INDEX_SUFFIX = '__tag_index'
+
+# Filter operators Firestore accepts
+_VALID_OPS = frozenset({'==', '!=', '<', '<=', '>', '>=', 'in', 'not-in', 'array_contains', 'array_contains_any'})
+
+# Operators comparing against a list of values
+_LIST_OPS = frozenset({'in', 'not-in', 'array_contains_any'})
+
+# Soft-deleted documents are moved out of a collection into its
+# {collection}__deleted partition, so live queries need no deleted_at filter
+DELETED_SUFFIX = '__deleted'
 
 class MetadataManagerError(Exception):
     """Custom exception for MetadataManager-related errors."""
     pass
 
+class NotFoundError(MetadataManagerError):
+    """Raised when a document to be modified does not exist."""
+    pass
+
+class AlreadyExistsError(MetadataManagerError):
+    """Raised when creating a document whose ID is already taken."""
+    pass
+
+class RetryableError(MetadataManagerError):
+    """Raised for transient Firestore failures that are safe to retry later."""
+    pass
+
+# Transient failures: contention aborts, deadlines, quota exhaustion and unavailability
+_RETRYABLE_ERRORS = (Aborted, DeadlineExceeded, ResourceExhausted, ServiceUnavailable)
+
+def _firestore_error(message: str, error: Exception) -> MetadataManagerError:
+    """Map a failure to the MetadataManagerError subclass callers can act on."""
+    if isinstance(error, NotFound):
+        return NotFoundError(f"{message}: {error.message}")
+    if isinstance(error, AlreadyExists):
+        return AlreadyExistsError(f"{message}: {error.message}")
+    if isinstance(error, _RETRYABLE_ERRORS):
+        return RetryableError(f"{message}: {error.message}")
+    return MetadataManagerError(f"{message}: {error}")
+
+def _retrying(*errors: type) -> Callable:
+    """Retry a Firestore call on the given transient errors with exponential backoff."""
+    return retry(retry=retry_if_exception_type(errors), wait=wait_exponential(multiplier=0.1, max=5),
+                 stop=stop_after_attempt(BULK_WRITE_MAX_ATTEMPTS), reraise=True)
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values orjson does not handle natively."""
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj)
+    if isinstance(obj, firestore.GeoPoint):
+        return {'latitude': obj.latitude, 'longitude': obj.longitude}
+    if isinstance(obj, (firestore.DocumentReference, firestore.AsyncDocumentReference)):
+        return {'__ref__': obj.path}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _check_filters(filters: Optional[List[Dict[str, Any]]]) -> bool:
+    """
+    Validate filters before any request is made, raising ValueError for a
+    malformed one. Returns False if a filter can match nothing.
+    """
+    matchable = True
+    for f in filters or []:
+        if not isinstance(f, dict) or not {'field', 'op', 'value'} <= f.keys():
+            raise ValueError(f"Invalid filter {f!r}: expected field, op and value")
+        if f['op'] not in _VALID_OPS:
+            raise ValueError(f"Invalid filter {f!r}: unsupported operator {f['op']!r}")
+        if f['op'] in _LIST_OPS:
+            if not isinstance(f['value'], (list, tuple)):
+                raise ValueError(f"Invalid filter {f!r}: {f['op']} requires a list value")
+            if not f['value']:
+                # An empty 'in' list matches nothing; an empty 'not-in' list is rejected by Firestore
+                if f['op'] == 'not-in':
+                    raise ValueError(f"Invalid filter {f!r}: not-in requires a non-empty list")
+                matchable = False
+    return matchable
+
+def _build_query(collection_ref: Any, filters: Optional[List[Dict[str, Any]]] = None) -> Any:
+    """Build a collection query with the caller's filters applied."""
+    query = collection_ref
+    
+    for f in filters or []:
+        query = query.where(filter=FieldFilter(f['field'], f['op'], f['value']))
+    
+    return query
+
+@_retrying(*_RETRYABLE_ERRORS)
+def _get(doc_ref: Any) -> Any:
+    """Read a document snapshot, retrying transient failures."""
+    return doc_ref.get()
+
+@_retrying(*_RETRYABLE_ERRORS)
+def _count(query: Any) -> int:
+    """Count a query's matches with a server-side aggregation."""
+    return query.count(alias='total').get()[0][0].value
+
+def _snapshot_field(snapshot: Any, field: str) -> Any:
+    """Read one field from a document snapshot without building its full dict."""
+    try:
+        return snapshot.get(field)
+    except KeyError:
+        return None
+
+# Update values Firestore resolves on the server instead of storing as given
+_TRANSFORMS = (Sentinel, ArrayUnion, ArrayRemove, Increment, Maximum, Minimum)
+
+def _resolve_transform(old: Any, value: Any) -> Any:
+    """Resolve an update value against a field's current value, as Firestore would."""
+    if isinstance(value, ArrayUnion):
+        result = list(old) if isinstance(old, list) else []
+        for item in value.values:
+            if item not in result:
+                result.append(item)
+        return result
+    if isinstance(value, ArrayRemove):
+        return [item for item in old if item not in value.values] if isinstance(old, list) else []
+    if isinstance(value, (Increment, Maximum, Minimum)):
+        # Numeric transforms on a missing or non-numeric field store the operand
+        if not isinstance(old, (int, float)):
+            return value.value
+        if isinstance(value, Increment):
+            return old + value.value
+        return max(old, value.value) if isinstance(value, Maximum) else min(old, value.value)
+    return value
+
+def _without_transforms(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop values only the server can resolve, leaving what the caller can be told."""
+    return {key: value for key, value in data.items() if not isinstance(value, _TRANSFORMS)}
+
+def _apply_updates(current: Dict[str, Any], updates: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Document data after applying update() field paths and transforms locally.
+    
+    Server timestamps are left as sentinels for a later set() to resolve.
+    """
+    data = dict(current)
+    for path, value in updates.items():
+        *parents, leaf = path.split('.')
+        target = data
+        for key in parents:
+            child = target.get(key)
+            target[key] = dict(child) if isinstance(child, dict) else {}
+            target = target[key]
+        if value is firestore.DELETE_FIELD:
+            target.pop(leaf, None)
+        else:
+            target[leaf] = _resolve_transform(target.get(leaf), value)
+    return data
+
+def _live_tags(data: Dict[str, Any]) -> Set[str]:
+    """Tags a document contributes to the tag index (none once soft-deleted)."""
+    if data.get('deleted_at'):
+        return set()
+    return set(data.get('tags') or [])
+
+def _order(query: Any, order_by: str, descending: bool) -> Any:
+    """Apply the sort order to a query, breaking ties on the document ID."""
+    direction = firestore.Query.DESCENDING if descending else firestore.Query.ASCENDING
+    return query.order_by(order_by, direction=direction).order_by('__name__', direction=direction)
+
+def _with_id(doc: Any) -> Dict[str, Any]:
+    """A document snapshot's data, carrying its document ID."""
+    return {**doc.to_dict(), 'id': doc.id}
+
+def _index_hint(collection: str, filters: Optional[List[Dict[str, Any]]],
+                order_by: str, descending: bool) -> str:
+    """gcloud command creating the composite index a filtered, ordered query needs."""
+    equality, ranges = [], []
+    for f in filters or []:
+        if f['op'] in ('array_contains', 'array_contains_any'):
+            equality.append(f"field-path={f['field']},array-config=contains")
+        elif f['op'] in ('==', 'in'):
+            equality.append(f"field-path={f['field']},order=ascending")
+        elif f['field'] != order_by:
+            ranges.append(f"field-path={f['field']},order=ascending")
+    order = f"field-path={order_by},order={'descending' if descending else 'ascending'}"
+    
+    field_configs = ' '.join(f'--field-config={config}' for config in dict.fromkeys(equality + ranges + [order]))
+    return (f"gcloud firestore indexes composite create --collection-group={collection} "
+            f"--query-scope=COLLECTION {field_configs}")
+
+def _merge_window(streams: List[Iterable[Dict[str, Any]]], order_by: str, descending: bool,
+                  offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Merge documents streamed in order from several partitions and cut one window out of them."""
+    merged = heapq.merge(*streams, key=lambda data: (data.get(order_by), data['id']), reverse=descending)
+    return list(islice(merged, offset, offset + limit if limit else None))
+
+def _query_cursor(start_after: Dict[str, Any]) -> Dict[str, Any]:
+    """Firestore cursor for a next_cursor dict, its document ID breaking sort ties."""
+    cursor = dict(start_after)
+    if 'id' in cursor:
+        cursor['__name__'] = cursor.pop('id')
+    return cursor
+
+async def _collect(query: Any) -> List[Dict[str, Any]]:
+    """Stream an async query into a list of document dictionaries."""
+    return [_with_id(doc) async for doc in query.stream()]
+
+def _apply_write(writer: Any, operation: str, doc_ref: Any, data: Optional[Dict[str, Any]]) -> None:
+    """Apply one (operation, doc_ref, data) write to a WriteBatch or Transaction."""
+    if operation == 'delete':
+        writer.delete(doc_ref)
+    elif operation == 'merge':
+        writer.set(doc_ref, data, merge=True)
+    else:
+        getattr(writer, operation)(doc_ref, data)
+
+def _partition_writes(live_ref: Any, deleted_ref: Any, in_live: bool, current: Dict[str, Any],
+                      updates: Optional[Dict[str, Any]]) -> List[Tuple[str, Any, Optional[Dict[str, Any]]]]:
+    """
+    Writes applying updates (or, when None, a delete) to a document, moving
+    it between the live and deleted partitions when deleted_at changes.
+    
+    A move is a set followed by a delete and must be committed atomically.
+    """
+    source_ref = live_ref if in_live else deleted_ref
+    if updates is None:
+        return [('delete', source_ref, None)]
+    
+    data = _apply_updates(current, updates)
+    target_ref = deleted_ref if data.get('deleted_at') else live_ref
+    if target_ref is source_ref:
+        return [('update', source_ref, updates)]
+    return [('set', target_ref, data), ('delete', source_ref, None)]
+
+def _tag_count_writes(tag_index: Any, deltas: Counter) -> List[Tuple[Any, Dict[str, Any]]]:
+    """Build merge-set (doc_ref, data) writes applying per-tag count deltas to a tag index collection."""
+    return [
+        # Tags may contain characters that are not valid in document IDs
+        (tag_index.document(quote(tag, safe='')), {'tag': tag, 'count': firestore.Increment(delta)})
+        for tag, delta in deltas.items() if delta
+    ]
+
+def _tag_deltas(current: Dict[str, Any], updates: Optional[Dict[str, Any]]) -> Counter:
+    """Per-tag count change from applying updates (or, when None, a delete) to a document."""
+    deltas = Counter() if updates is None else Counter(_live_tags(_apply_updates(current, updates)))
+    deltas.subtract(_live_tags(current))
+    return deltas
+
 class MetadataManager:
     """
     A utility class for managing Firestore document operations.
     
+    Soft-deleted documents are kept in a separate {collection}__deleted
+    partition, so queries over live documents need no deleted_at filter.
+    
     Key methods:
-    - create_document(collection, data, custom_timestamps=None) -> dict
-    - read_document(collection, document_id, include_deleted=False) -> Optional[dict]
-    - update_document(collection, document_id, updates) -> dict
+    - create_document(collection, data, custom_timestamps=None, doc_id=None,
+                      return_server_state=False) -> dict
+    - create_documents_bulk(collection, docs, custom_timestamps=None) -> List[dict]
+    - create_documents(collection, items, custom_timestamps=None) -> List[str]
+    - read_document(collection, document_id, include_deleted=False,
+                    ttl_seconds=None) -> Optional[dict]
+    - read_many(collection, document_ids, include_deleted=False,
+                ttl_seconds=None) -> List[Optional[dict]]
+    - read_documents(collection, document_ids, include_deleted=False) -> Dict[str, dict]
+    - update_document(collection, document_id, updates, include_deleted=False,
+                      return_server_state=False) -> dict
     - list_documents(collection, include_deleted=False, limit=None, order_by='created_at', 
-                    descending=True, filters=None, page=None, per_page=None) -> dict
+                    descending=True, filters=None, page=None, per_page=None,
+                    start_after=None, fields=None, include_total=True) -> dict
+    - count_documents(collection, include_deleted=False, filters=None,
+                      order_by=None, descending=True) -> int
     - soft_delete(collection, document_id) -> bool
     - restore_document(collection, document_id) -> bool
     - hard_delete_document(collection, document_id) -> bool
+    - invalidate(collection, document_id) -> None
+    - soft_delete_many(collection, document_ids) -> bool
+    - hard_delete_many(collection, document_ids) -> bool
+    - get_distinct_tags(collection, include_deleted=False) -> List[str]
+    - rebuild_tag_index(collection) -> int
+    - partition_deleted(collection) -> int
+    - to_json(obj) -> bytes
+    - configure(client) -> None
 
     All documents automatically include:
     - id: str (document ID)
@@ -27,75 +322,409 @@ class MetadataManager:
     - updated_at: datetime 
     - deleted_at: Optional[datetime]
 
-    Raises MetadataManagerError for operation failures.
+    Raises MetadataManagerError for operation failures, or one of its
+    subclasses: NotFoundError and AlreadyExistsError for missing or taken
+    documents, and RetryableError for transient failures (contention,
+    deadlines, quota) that are worth retrying. The original Firestore
+    exception is chained as __cause__.
     """
 
-    db = firestore.Client()
+    # Injected client, if any; otherwise the shared client is created on first use
+    _db: Optional[firestore.Client] = None
+
+    @classmethod
+    def db(cls) -> firestore.Client:
+        """Firestore client used by MetadataManager, created on first use."""
+        if cls._db is None:
+            cls._db = get_firestore_client()
+        return cls._db
+
+    @classmethod
+    def configure(cls, client: firestore.Client) -> None:
+        """
+        Sets the Firestore client MetadataManager uses, e.g. an emulator or
+        test client.
+        
+        Args:
+            client: Firestore client to use from now on
+        """
+        cls._db = client
+        cls._col.cache_clear()
+        with _READ_CACHE_LOCK:
+            _READ_CACHE.clear()
+
+    @staticmethod
+    def to_json(obj: Any) -> bytes:
+        """
+        Serializes documents returned by MetadataManager to JSON with orjson.
+        
+        Firestore timestamps are encoded natively (naive datetimes as UTC);
+        sets, GeoPoints and document references are converted as well.
+        
+        Args:
+            obj: Document dictionary, list of documents or listing result
+            
+        Returns:
+            UTF-8 encoded JSON
+        """
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _col(name: str) -> firestore.CollectionReference:
+        """Cached reference to a collection by name."""
+        return MetadataManager.db().collection(name)
 
     @staticmethod
     def create_document(collection: str, data: Dict[str, Any], 
-                        custom_timestamps: Optional[Dict[str, datetime]] = None) -> Dict[str, Any]:
+                        custom_timestamps: Optional[Dict[str, datetime]] = None,
+                        doc_id: Optional[str] = None,
+                        return_server_state: bool = False) -> Dict[str, Any]:
         """
         Creates a new document in Firestore with automatic timestamp.
         
+        The document ID is always chosen client-side and the write uses
+        create(), so retrying with the same doc_id can never overwrite an
+        existing document. created_at and updated_at, unless given in
+        custom_timestamps, are stored as the server's commit time.
+        
         Args:
             collection: Name of the Firestore collection
             data: Document data to store
             custom_timestamps: Optional dict with custom timestamp values
                                (e.g., {'created_at': custom_datetime})
+            doc_id: Optional document ID; a random ID is generated if omitted
+            return_server_state: If True, read the document back after the
+                                 write and return it as stored
             
         Returns:
-            Dictionary containing the document data and its ID
+            Dictionary containing the document data and its ID; automatic
+            timestamps are taken from the client clock and only approximate
+            the stored ones, which callers displaying them should read back
             
         Raises:
             ValueError: If collection is empty or data is invalid
+            AlreadyExistsError: If doc_id already exists
             MetadataManagerError: If database operation fails
         """
         if not collection or not isinstance(data, dict):
             raise ValueError("Invalid collection name or data format")
             
         try:
-            doc_ref = MetadataManager.db.collection(collection).document()
-            doc_data = data.copy()
-            
-            # Set default timestamps
-            now = datetime.utcnow()
-            timestamp_data = {
-                'id': doc_ref.id,  # Include document ID in the data
-                'created_at': now,
-                'updated_at': now,
-                'deleted_at': None
-            }
-            
-            # Override with custom timestamps if provided
-            if custom_timestamps:
-                for key, value in custom_timestamps.items():
-                    if key in timestamp_data:
-                        timestamp_data[key] = value
+            doc_ref = MetadataManager._col(collection).document(doc_id)
+            doc_data = MetadataManager._with_timestamps(doc_ref.id, data, custom_timestamps)
             
-            doc_data.update(timestamp_data)
-            doc_ref.set(doc_data)
-            
-            # Store with server timestamp in Firestore
-            # firestore_data = doc_data.copy()
-            # firestore_data['created_at'] = firestore.SERVER_TIMESTAMP
-            # firestore_data['updated_at'] = firestore.SERVER_TIMESTAMP
-            # doc_ref.set(firestore_data)
+            # Create the document and count its tags in one atomic commit
+            batch = MetadataManager.db().batch()
+            batch.create(doc_ref, MetadataManager._server_timestamped(doc_data, custom_timestamps))
+            for tag_ref, tag_data in MetadataManager._tag_index_writes(collection, Counter(_live_tags(doc_data))):
+                batch.set(tag_ref, tag_data, merge=True)
+            batch.commit()
             
+            if return_server_state:
+                return MetadataManager.read_document(collection, doc_ref.id, include_deleted=True)
             # Return JSON serializable data
             return doc_data
         except Exception as e:
-            raise MetadataManagerError(f"Failed to create document: {str(e)}")
+            raise _firestore_error("Failed to create document", e) from e
+
+    @staticmethod
+    def create_documents_bulk(collection: str, docs: List[Dict[str, Any]],
+                              custom_timestamps: Optional[List[Optional[Dict[str, datetime]]]] = None) -> List[Dict[str, Any]]:
+        """
+        Creates many documents through a Firestore BulkWriter.
+        
+        Writes are pipelined and committed in batches instead of paying one
+        round trip per document. Once they finish, the tag index is updated
+        in atomic WriteBatches for the documents Firestore confirmed, so
+        failed or retried creates are never counted.
+        
+        Args:
+            collection: Name of the Firestore collection
+            docs: Document data to store, one dict per document
+            custom_timestamps: Optional list, parallel to docs, of custom
+                               timestamp dicts (or None) for each document
+            
+        Returns:
+            List of stored document dictionaries, in the same order as docs,
+            with client-clock approximations of the stored server timestamps
+            
+        Raises:
+            ValueError: If collection is empty or any document is invalid
+            MetadataManagerError: If any write fails
+        """
+        if not collection or not all(isinstance(d, dict) for d in docs):
+            raise ValueError("Invalid collection name or data format")
+        if custom_timestamps is not None and len(custom_timestamps) != len(docs):
+            raise ValueError("custom_timestamps must match the number of documents")
+            
+        try:
+            collection_ref = MetadataManager._col(collection)
+            failures, confirmed = [], []
+            
+            def _on_write_error(error, _bulk_writer) -> bool:
+                if error.attempts < BULK_WRITE_MAX_ATTEMPTS:
+                    return True
+                failures.append(error)
+                return False
+            
+            bulk_writer = MetadataManager.db().bulk_writer()
+            bulk_writer.on_write_error(_on_write_error)
+            bulk_writer.on_write_result(lambda doc_ref, _result, _bulk_writer: confirmed.append(doc_ref.id))
+            
+            created = []
+            now = datetime.now(timezone.utc)
+            for i, data in enumerate(docs):
+                doc_ref = collection_ref.document()
+                custom = custom_timestamps[i] if custom_timestamps else None
+                doc_data = MetadataManager._with_timestamps(doc_ref.id, data, custom, now)
+                bulk_writer.create(doc_ref, MetadataManager._server_timestamped(doc_data, custom))
+                created.append(doc_data)
+            
+            bulk_writer.close()
+            
+            confirmed_ids = set(confirmed)
+            tag_counts = Counter()
+            for doc_data in created:
+                if doc_data['id'] in confirmed_ids:
+                    tag_counts.update(_live_tags(doc_data))
+            MetadataManager._commit_in_batches([
+                ('merge', tag_ref, tag_data)
+                for tag_ref, tag_data in MetadataManager._tag_index_writes(collection, tag_counts)
+            ])
+        except Exception as e:
+            raise _firestore_error("Failed to create documents", e) from e
+        
+        if failures:
+            raise MetadataManagerError(
+                f"Failed to create {len(failures)} of {len(docs)} documents: {failures[0].message}"
+            )
+        return created
+
+    @staticmethod
+    # A DeadlineExceeded commit may still have been applied, so only failures
+    # that guarantee nothing was written are retried
+    @_retrying(Aborted, ResourceExhausted)
+    def _commit_batch(batch: firestore.WriteBatch) -> None:
+        """Commit a WriteBatch, retrying transient contention aborts and quota errors."""
+        batch.commit()
+
+    @staticmethod
+    def _commit_in_batches(writes: List[Tuple[str, Any, Optional[Dict[str, Any]]]]) -> None:
+        """
+        Commit (operation, doc_ref, data) writes in WriteBatches of
+        BATCH_WRITE_SIZE, committing the batches concurrently.
+        
+        BATCH_WRITE_SIZE is even, so partition moves (set/delete pairs)
+        placed at the start of writes are never split across batches.
+        """
+        MetadataManager._commit_write_groups([writes[start:start + BATCH_WRITE_SIZE]
+                                              for start in range(0, len(writes), BATCH_WRITE_SIZE)])
+
+    @staticmethod
+    def _commit_write_groups(groups: List[List[Tuple[str, Any, Optional[Dict[str, Any]]]]]) -> None:
+        """
+        Commit each group of (operation, doc_ref, data) writes as one atomic
+        WriteBatch, committing the batches concurrently.
+        
+        Every batch is waited for; the first failure is then raised, and the
+        other batches stay committed.
+        """
+        batches = []
+        for group in groups:
+            batch = MetadataManager.db().batch()
+            for operation, doc_ref, data in group:
+                _apply_write(batch, operation, doc_ref, data)
+            batches.append(batch)
+        
+        futures = [_EXECUTOR.submit(MetadataManager._commit_batch, batch) for batch in batches]
+        errors = [future.exception() for future in futures]
+        for error in errors:
+            if error is not None:
+                raise error
+
+    @staticmethod
+    def create_documents(collection: str, items: List[Dict[str, Any]],
+                         custom_timestamps: Optional[List[Optional[Dict[str, datetime]]]] = None) -> List[str]:
+        """
+        Creates many documents in atomic WriteBatches of BATCH_WRITE_SIZE.
+        
+        Unlike create_documents_bulk, each batch either succeeds or fails as
+        a whole.
+        
+        Args:
+            collection: Name of the Firestore collection
+            items: Document data to store, one dict per document
+            custom_timestamps: Optional list, parallel to items, of custom
+                               timestamp dicts (or None) for each document
+            
+        Returns:
+            List of created document IDs, in the same order as items
+            
+        Raises:
+            ValueError: If collection is empty or any document is invalid
+            MetadataManagerError: If a batch fails to commit
+        """
+        if not collection or not all(isinstance(d, dict) for d in items):
+            raise ValueError("Invalid collection name or data format")
+        if custom_timestamps is not None and len(custom_timestamps) != len(items):
+            raise ValueError("custom_timestamps must match the number of documents")
+            
+        try:
+            collection_ref = MetadataManager._col(collection)
+            writes = []
+            tag_counts = Counter()
+            now = datetime.now(timezone.utc)
+            for i, data in enumerate(items):
+                doc_ref = collection_ref.document()
+                custom = custom_timestamps[i] if custom_timestamps else None
+                doc_data = MetadataManager._with_timestamps(doc_ref.id, data, custom, now)
+                writes.append(('create', doc_ref, MetadataManager._server_timestamped(doc_data, custom)))
+                tag_counts.update(_live_tags(doc_data))
+            
+            doc_ids = [doc_ref.id for _, doc_ref, _ in writes]
+            writes.extend(
+                ('merge', tag_ref, tag_data)
+                for tag_ref, tag_data in MetadataManager._tag_index_writes(collection, tag_counts)
+            )
+            MetadataManager._commit_in_batches(writes)
+            return doc_ids
+        except Exception as e:
+            raise _firestore_error("Failed to create documents", e) from e
+
+    @staticmethod
+    def _tag_index(collection: str) -> firestore.CollectionReference:
+        """Collection holding one document per tag with its live document count."""
+        return MetadataManager._col(f"{collection}{TAG_INDEX_SUFFIX}")
+
+    @staticmethod
+    def _deleted_col(collection: str) -> firestore.CollectionReference:
+        """Partition holding a collection's soft-deleted documents."""
+        return MetadataManager._col(f"{collection}{DELETED_SUFFIX}")
+
+    @staticmethod
+    def _partitions(collection: str, include_deleted: bool) -> List[firestore.CollectionReference]:
+        """Collections a read covers: the live one, plus the deleted partition if included."""
+        if include_deleted:
+            return [MetadataManager._col(collection), MetadataManager._deleted_col(collection)]
+        return [MetadataManager._col(collection)]
+
+    @staticmethod
+    def _tag_index_writes(collection: str, deltas: Counter) -> List[Tuple[Any, Dict[str, Any]]]:
+        """Build merge-set (doc_ref, data) writes applying per-tag count deltas."""
+        return _tag_count_writes(MetadataManager._tag_index(collection), deltas)
+
+    @staticmethod
+    def _write_tracking_tags(collection: str, document_id: str, updates: Optional[Dict[str, Any]],
+                             check: Optional[Callable[[Dict[str, Any]], None]] = None) -> bool:
+        """
+        Update (or, when updates is None, delete) a document in a transaction
+        that also adjusts the tag index for any change in its live tags.
+        
+        The document is looked up in both partitions and moved between them
+        when the update sets or clears deleted_at. check, if given, is called
+        with the document's current data and may raise to abort the write.
+        Returns False if a document to be deleted does not exist.
+        """
+        live_ref = MetadataManager._col(collection).document(document_id)
+        deleted_ref = MetadataManager._deleted_col(collection).document(document_id)
+        
+        @firestore.transactional
+        def run(transaction) -> bool:
+            snapshot = live_ref.get(transaction=transaction)
+            in_live = snapshot.exists
+            if not in_live:
+                snapshot = deleted_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                if updates is None:
+                    return False
+                raise NotFoundError(f"Document {document_id} not found")
+            
+            current = snapshot.to_dict()
+            if check:
+                check(current)
+            
+            writes = _partition_writes(live_ref, deleted_ref, in_live, current, updates)
+            writes.extend(('merge', tag_ref, tag_data) for tag_ref, tag_data
+                          in MetadataManager._tag_index_writes(collection, _tag_deltas(current, updates)))
+            for operation, doc_ref, data in writes:
+                _apply_write(transaction, operation, doc_ref, data)
+            return True
+        
+        return run(MetadataManager.db().transaction())
+
+    @staticmethod
+    def _with_timestamps(doc_id: str, data: Dict[str, Any],
+                         custom_timestamps: Optional[Dict[str, datetime]] = None,
+                         now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Copy document data and add the ID and automatic timestamp fields.
+        
+        Batch creators pass one shared now for the whole batch.
+        """
+        # Set default timestamps
+        if now is None:
+            now = datetime.now(timezone.utc)
+        timestamp_data = {
+            'id': doc_id,  # Include document ID in the data
+            'created_at': now,
+            'updated_at': now,
+            'deleted_at': None
+        }
+        
+        # Override with custom timestamps if provided
+        if custom_timestamps:
+            for key, value in custom_timestamps.items():
+                if key in timestamp_data:
+                    timestamp_data[key] = value
+        
+        return {**data, **timestamp_data}
+
+    @staticmethod
+    def _server_timestamped(doc_data: Dict[str, Any],
+                            custom_timestamps: Optional[Dict[str, datetime]] = None) -> Dict[str, Any]:
+        """
+        Document data as written: automatic created_at/updated_at become
+        server timestamps, so ordering doesn't depend on client clocks.
+        """
+        custom = custom_timestamps or {}
+        return {**doc_data, **{key: firestore.SERVER_TIMESTAMP
+                               for key in ('created_at', 'updated_at') if key not in custom}}
+
+    @staticmethod
+    def invalidate(collection: str, document_id: str) -> None:
+        """
+        Drops a document from the read cache.
+        
+        Writes made through MetadataManager do this automatically; call it
+        after writing a document by other means.
+        
+        Args:
+            collection: Name of the Firestore collection
+            document_id: Document's unique identifier
+        """
+        with _READ_CACHE_LOCK:
+            _READ_CACHE.pop((collection, document_id), None)
 
     @staticmethod
-    def read_document(collection: str, document_id: str, include_deleted: bool = False) -> Optional[Dict[str, Any]]:
+    def read_document(collection: str, document_id: str, include_deleted: bool = False,
+                      ttl_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Retrieves a document by ID, with option to include soft-deleted documents.
         
+        With ttl_seconds, the read may be served from an in-process cache
+        entry at most that old. Writes made through MetadataManager
+        invalidate the entry, but only in this process, so leave the cache
+        off where other processes write the same documents. Reads with
+        include_deleted=True always go to Firestore, and fall back to the
+        deleted partition when the document isn't live.
+        
         Args:
             collection: Name of the Firestore collection
             document_id: Document's unique identifier
             include_deleted: If True, returns document even if soft-deleted
+            ttl_seconds: Maximum age of a cached read to accept; by default
+                         the cache is neither read nor filled
             
         Returns:
             Document data dictionary or None if not found or soft-deleted
@@ -107,54 +736,177 @@ class MetadataManager:
         if not collection or not document_id:
             raise ValueError("Collection and document_id must not be empty")
             
+        key = (collection, document_id)
+        data = None
+        if ttl_seconds and not include_deleted:
+            with _READ_CACHE_LOCK:
+                entry = _READ_CACHE.get(key)
+            if entry and time.monotonic() - entry[0] < ttl_seconds:
+                data = entry[1]
+            
+        if data is None:
+            try:
+                doc = _get(MetadataManager._col(collection).document(document_id))
+                if doc.exists:
+                    data = doc.to_dict()
+                    if ttl_seconds:
+                        with _READ_CACHE_LOCK:
+                            _READ_CACHE[key] = (time.monotonic(), data)
+                else:
+                    if include_deleted:
+                        doc = _get(MetadataManager._deleted_col(collection).document(document_id))
+                    if not doc.exists:
+                        return None  # Return None instead of raising ValueError
+                    data = doc.to_dict()
+            except Exception as e:
+                raise _firestore_error("Failed to read document", e) from e
+        
+        if not include_deleted and data.get('deleted_at'):
+            return None
+        return data.copy()
+
+    @staticmethod
+    def read_many(collection: str, document_ids: List[str], include_deleted: bool = False,
+                  ttl_seconds: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Reads many documents concurrently on a shared thread pool.
+        
+        Args:
+            collection: Name of the Firestore collection
+            document_ids: Unique identifiers of the documents to read
+            include_deleted: If True, returns documents even if soft-deleted
+            ttl_seconds: Maximum age of a cached read to accept, as for
+                         read_document
+            
+        Returns:
+            Document data (or None, as for read_document) for each ID, in order
+            
+        Raises:
+            MetadataManagerError: If database operation fails
+        """
+        futures = [
+            _EXECUTOR.submit(MetadataManager.read_document, collection, doc_id, include_deleted, ttl_seconds)
+            for doc_id in document_ids
+        ]
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def read_documents(collection: str, document_ids: List[str],
+                       include_deleted: bool = False) -> Dict[str, Dict[str, Any]]:
+        """
+        Reads many documents in a single batched get_all RPC.
+        
+        One streaming round trip serves up to hundreds of documents, so
+        prefer this over read_many when the reads are not already cached.
+        Like read_document, it checks deleted_at as well as the partition,
+        so a document soft-deleted before partitioning stays hidden until
+        partition_deleted moves it.
+        
+        Args:
+            collection: Name of the Firestore collection
+            document_ids: Unique identifiers of the documents to read
+            include_deleted: If True, includes soft-deleted documents
+            
+        Returns:
+            Document data keyed by document ID; missing (and, unless
+            include_deleted, soft-deleted) documents are omitted
+            
+        Raises:
+            MetadataManagerError: If database operation fails
+        """
+        if not document_ids:
+            return {}
+            
         try:
-            doc = MetadataManager.db.collection(collection).document(document_id).get()
-            if not doc.exists:
-                return None  # Return None instead of raising ValueError
-                
-            data = doc.to_dict()
-            if not include_deleted and data.get('deleted_at'):
-                return None
-            return data
+            collection_ref = MetadataManager._col(collection)
+            snapshots = MetadataManager.db().get_all([collection_ref.document(doc_id) for doc_id in document_ids])
+            
+            documents = {}
+            for snapshot in snapshots:
+                if not snapshot.exists:
+                    continue
+                data = snapshot.to_dict()
+                if include_deleted or not data.get('deleted_at'):
+                    documents[snapshot.id] = data.copy()
+            
+            missing = [doc_id for doc_id in document_ids if doc_id not in documents]
+            if include_deleted and missing:
+                deleted_ref = MetadataManager._deleted_col(collection)
+                for snapshot in MetadataManager.db().get_all([deleted_ref.document(doc_id) for doc_id in missing]):
+                    if snapshot.exists:
+                        documents[snapshot.id] = snapshot.to_dict()
+            return documents
         except Exception as e:
-            raise MetadataManagerError(f"Failed to read document: {str(e)}")
+            raise _firestore_error("Failed to read documents", e) from e
 
     @staticmethod
-    def update_document(collection: str, document_id: str, updates: Dict[str, Any]) -> Dict[str, Any]:
+    def update_document(collection: str, document_id: str, updates: Dict[str, Any],
+                        include_deleted: bool = False, return_server_state: bool = False) -> Dict[str, Any]:
         """
         Updates specific fields in an existing document.
         
+        An update that doesn't touch tags or deleted_at is a single write to
+        the live document, and nothing is read back. Updates to tags or
+        deleted_at run in a transaction that reads the document so the tag
+        index stays exact and the document moves partition as needed.
+        Soft-deleted documents are treated as missing unless include_deleted
+        is set.
+        
+        Keys may be dotted field paths ('author.name') to update nested
+        fields, and values may be server-side transforms such as
+        firestore.Increment(1) or firestore.ArrayUnion([...]), which Firestore
+        applies atomically instead of a client read-modify-write.
+        
         Args:
             collection: Name of the Firestore collection
             document_id: Document's unique identifier
-            updates: Dictionary of fields and values to update
+            updates: Dictionary of field paths and values (or transforms) to update
+            include_deleted: If True, soft-deleted documents are updated too
+            return_server_state: If True, read the document back after the
+                                 write and return it as stored
             
         Returns:
-            Complete updated document data
+            The applied updates, minus transforms only the server resolves,
+            with the document ID and an updated_at taken from the client
+            clock (Firestore stores the server's commit time); or the stored
+            document with return_server_state=True
             
         Raises:
-            ValueError: If document doesn't exist or is soft-deleted
+            ValueError: If required parameters are missing
+            NotFoundError: If document doesn't exist, or is soft-deleted and
+                           include_deleted is not set
             MetadataManagerError: If database operation fails
         """
         if not collection or not document_id or not updates:
             raise ValueError("Missing required parameters")
             
         try:
-            doc_ref = MetadataManager.db.collection(collection).document(document_id)
-            current = doc_ref.get()
+            update_data = {**updates, 'updated_at': firestore.SERVER_TIMESTAMP}
             
-            if not current.exists:
-                raise ValueError(f"Document {document_id} not found")
+            if 'tags' in updates or 'deleted_at' in updates:
+                def _check(current: Dict[str, Any]) -> None:
+                    if not include_deleted and current.get('deleted_at'):
+                        raise NotFoundError(f"Document {document_id} not found")
                 
-            if current.to_dict().get('deleted_at'):
-                raise ValueError(f"Cannot update deleted document {document_id}")
-                
-            updates['updated_at'] = firestore.SERVER_TIMESTAMP
-            doc_ref.update(updates)
+                MetadataManager._write_tracking_tags(collection, document_id, update_data, _check)
+            else:
+                try:
+                    MetadataManager._col(collection).document(document_id).update(update_data)
+                except NotFound:
+                    if not include_deleted:
+                        raise
+                    MetadataManager._deleted_col(collection).document(document_id).update(update_data)
+            MetadataManager.invalidate(collection, document_id)
             
-            return MetadataManager.read_document(collection, document_id)
+            if return_server_state:
+                return MetadataManager.read_document(collection, document_id, include_deleted=True)
+            return {**_without_transforms(updates), 'id': document_id, 'updated_at': datetime.now(timezone.utc)}
+        except NotFound as e:
+            raise NotFoundError(f"Document {document_id} not found") from e
+        except NotFoundError:
+            raise
         except Exception as e:
-            raise MetadataManagerError(f"Failed to update document: {str(e)}")
+            raise _firestore_error("Failed to update document", e) from e
 
     @staticmethod
     def list_documents(
@@ -165,11 +917,23 @@ class MetadataManager:
         descending: bool = True,
         filters: Optional[List[Dict[str, Any]]] = None,
         page: Optional[int] = None,
-        per_page: Optional[int] = None
+        per_page: Optional[int] = None,
+        start_after: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+        include_total: bool = True
     ) -> Dict[str, Any]:
         """
         Retrieves a filtered and ordered list of documents.
         
+        When paginating or limiting, only the requested documents are fetched
+        and the total comes from a server-side count aggregation run
+        concurrently. Passing the previous page's next_cursor as start_after
+        avoids the cost of skipping documents with an offset. With
+        include_deleted, the live collection and its deleted partition are
+        queried alike and their results merged. Documents sharing a sort
+        value are ordered by ID, and documents lacking the sort field are
+        neither listed nor counted.
+        
         Args:
             collection: Name of the Firestore collection
             include_deleted: If True, includes soft-deleted documents
@@ -187,6 +951,14 @@ class MetadataManager:
                     ]
             page: Page number for pagination (starting from 1)
             per_page: Number of items per page
+            start_after: Cursor ({order_by: value, 'id': document_id}) to
+                         resume after, as returned in next_cursor; takes
+                         the place of page
+            fields: Fields to return for each document; omitting this
+                    transfers every field of every document
+            include_total: If False, skip the count aggregation, and with
+                           it the shared thread pool; total and pages are
+                           then None
             
         Returns:
             Dictionary containing:
@@ -195,59 +967,134 @@ class MetadataManager:
                 page: Current page number (if pagination used)
                 per_page: Items per page (if pagination used)
                 pages: Total number of pages (if pagination used)
+                next_cursor: Cursor for the following page, or None on the
+                             last page (if pagination used)
             
         Raises:
-            MetadataManagerError: If database operation fails
+            ValueError: If a filter is malformed
+            MetadataManagerError: If database operation fails; if Firestore
+                                  reports a missing composite index, the
+                                  message includes the gcloud command that
+                                  creates it
         """
+        paginated = per_page is not None and (page is not None or start_after is not None)
+        if not _check_filters(filters):
+            if not paginated:
+                return {'items': [], 'total': 0}
+            return {'items': [], 'total': 0, 'page': page, 'per_page': per_page, 'pages': 0, 'next_cursor': None}
+            
         try:
-            query = MetadataManager.db.collection(collection)
+            partitions = MetadataManager._partitions(collection, include_deleted)
+            # Ordering drops documents lacking the sort field, so counts use the ordered queries too
+            counted = [_order(_build_query(collection_ref, filters), order_by, descending)
+                       for collection_ref in partitions]
+            queries = counted
+            if fields is not None:
+                # Merging partitions and building cursors need the sort field in every item
+                selected = fields if order_by in fields else [*fields, order_by]
+                queries = [query.select(selected) for query in queries]
             
-            if not include_deleted:
-                query = query.where(filter=FieldFilter('deleted_at', '==', None))
-
-            # Apply any additional filters
-            if filters:
-                for f in filters:
-                    query = query.where(filter=FieldFilter(f['field'], f['op'], f['value']))
-                
-            query = query.order_by(order_by, direction=firestore.Query.DESCENDING if descending else firestore.Query.ASCENDING)
-            
-            # Get all matching documents
-            all_docs = [doc.to_dict() for doc in query.stream()]
-            total_items = len(all_docs)
-
-            # Apply pagination if specified
-            if page is not None and per_page is not None:
-                start_idx = (page - 1) * per_page
-                end_idx = start_idx + per_page
-                items = all_docs[start_idx:end_idx]
-                total_pages = (total_items + per_page - 1) // per_page
-                
+            if not paginated and not limit:
+                all_docs = _merge_window([(_with_id(doc) for doc in query.stream()) for query in queries],
+                                         order_by, descending)
+                return {
+                    'items': all_docs,
+                    'total': len(all_docs)
+                }
+            
+            total_futures = [_EXECUTOR.submit(_count, query) for query in counted] if include_total else None
+            
+            if not paginated:
+                offset, window = 0, limit
+            elif start_after is not None:
+                queries = [query.start_after(_query_cursor(start_after)) for query in queries]
+                offset, window = 0, per_page
+            else:
+                offset, window = (page - 1) * per_page, per_page
+            
+            if len(queries) == 1:
+                query = queries[0].offset(offset) if offset else queries[0]
+                items = [_with_id(doc) for doc in query.limit(window).stream()]
+            else:
+                # Any partition may hold the whole window, so read that much of each
+                items = _merge_window([(_with_id(doc) for doc in query.limit(offset + window).stream())
+                                       for query in queries], order_by, descending, offset, window)
+            total_items = sum(future.result() for future in total_futures) if include_total else None
+            
+            if not paginated:
                 return {
                     'items': items,
-                    'total': total_items,
-                    'page': page,
-                    'per_page': per_page,
-                    'pages': total_pages
+                    'total': total_items
                 }
             
-            # Apply limit if specified
-            if limit:
-                all_docs = all_docs[:limit]
-                
+            next_cursor = None
+            if len(items) == per_page:
+                next_cursor = {order_by: items[-1][order_by], 'id': items[-1]['id']}
+            
             return {
-                'items': all_docs,
-                'total': total_items
+                'items': items,
+                'total': total_items,
+                'page': page,
+                'per_page': per_page,
+                'pages': (total_items + per_page - 1) // per_page if include_total else None,
+                'next_cursor': next_cursor
             }
             
+        except FailedPrecondition as e:
+            raise MetadataManagerError(
+                f"Failed to list documents: {e.message}; create the missing index with: "
+                f"{_index_hint(collection, filters, order_by, descending)}"
+            ) from e
+        except Exception as e:
+            raise _firestore_error("Failed to list documents", e) from e
+
+    @staticmethod
+    def count_documents(collection: str, include_deleted: bool = False,
+                        filters: Optional[List[Dict[str, Any]]] = None,
+                        order_by: Optional[str] = None, descending: bool = True) -> int:
+        """
+        Counts matching documents with server-side aggregations.
+        
+        Partitions are counted one after another, without the shared thread
+        pool, so this is safe to run on one.
+        
+        Args:
+            collection: Name of the Firestore collection
+            include_deleted: If True, counts soft-deleted documents too
+            filters: Filter dictionaries, as for list_documents
+            order_by: If given, only documents having this field are
+                      counted, matching what list_documents would list
+            descending: Sort order direction, as for list_documents; the
+                        count uses the same index as the listing
+            
+        Returns:
+            Number of matching documents
+            
+        Raises:
+            ValueError: If a filter is malformed
+            MetadataManagerError: If database operation fails
+        """
+        if not _check_filters(filters):
+            return 0
+            
+        try:
+            total = 0
+            for collection_ref in MetadataManager._partitions(collection, include_deleted):
+                query = _build_query(collection_ref, filters)
+                total += _count(_order(query, order_by, descending) if order_by else query)
+            return total
         except Exception as e:
-            raise MetadataManagerError(f"Failed to list documents: {str(e)}")
+            raise _firestore_error("Failed to count documents", e) from e
 
     @staticmethod
     def soft_delete(collection: str, document_id: str) -> bool:
         """
         Marks a document as deleted without removing it.
         
+        The document is moved to the collection's deleted partition, and its
+        tags removed from the tag index, in one transaction. Deleting an
+        already deleted document is refused.
+        
         Args:
             collection: Name of the Firestore collection
             document_id: Document's unique identifier
@@ -256,32 +1103,37 @@ class MetadataManager:
             True if successful
             
         Raises:
+            NotFoundError: If document doesn't exist
             ValueError: If document is already deleted
             MetadataManagerError: If database operation fails
         """
         try:
-            doc_ref = MetadataManager.db.collection(collection).document(document_id)
-            doc = doc_ref.get()
+            def _check(current: Dict[str, Any]) -> None:
+                if current.get('deleted_at'):
+                    raise ValueError(f"Document {document_id} is already deleted")
             
-            if not doc.exists:
-                raise ValueError(f"Document {document_id} not found")
-                
-            if doc.to_dict().get('deleted_at'):
-                raise ValueError(f"Document {document_id} is already deleted")
-                
-            doc_ref.update({
+            MetadataManager._write_tracking_tags(collection, document_id, {
                 'deleted_at': firestore.SERVER_TIMESTAMP,
                 'updated_at': firestore.SERVER_TIMESTAMP
-            })
+            }, _check)
+            MetadataManager.invalidate(collection, document_id)
             return True
+        except NotFound as e:
+            raise NotFoundError(f"Document {document_id} not found") from e
+        except NotFoundError:
+            raise
         except Exception as e:
-            raise MetadataManagerError(f"Failed to soft-delete document: {str(e)}")
+            raise _firestore_error("Failed to soft-delete document", e) from e
 
     @staticmethod
     def restore_document(collection: str, document_id: str) -> bool:
         """
         Restores a soft-deleted document.
         
+        The document is moved back from the deleted partition, and its tags
+        added back to the tag index, in one transaction. Restoring a document
+        that isn't deleted is refused.
+        
         Args:
             collection: Name of the Firestore collection
             document_id: Document's unique identifier
@@ -290,26 +1142,27 @@ class MetadataManager:
             True if successful
             
         Raises:
-            ValueError: If document isn't deleted or doesn't exist
+            NotFoundError: If document doesn't exist
+            ValueError: If document isn't deleted
             MetadataManagerError: If database operation fails
         """
         try:
-            doc_ref = MetadataManager.db.collection(collection).document(document_id)
-            doc = doc_ref.get()
+            def _check(current: Dict[str, Any]) -> None:
+                if not current.get('deleted_at'):
+                    raise ValueError(f"Document {document_id} is not deleted")
             
-            if not doc.exists:
-                raise ValueError(f"Document {document_id} not found")
-                
-            if not doc.to_dict().get('deleted_at'):
-                raise ValueError(f"Document {document_id} is not deleted")
-                
-            doc_ref.update({
+            MetadataManager._write_tracking_tags(collection, document_id, {
                 'deleted_at': None,
                 'updated_at': firestore.SERVER_TIMESTAMP
-            })
+            }, _check)
+            MetadataManager.invalidate(collection, document_id)
             return True
+        except NotFound as e:
+            raise NotFoundError(f"Document {document_id} not found") from e
+        except NotFoundError:
+            raise
         except Exception as e:
-            raise MetadataManagerError(f"Failed to restore document: {str(e)}")
+            raise _firestore_error("Failed to restore document", e) from e
 
     @staticmethod
     def hard_delete_document(collection: str, document_id: str) -> bool:
@@ -322,48 +1175,804 @@ class MetadataManager:
 
         Returns:
             bool: True if the deletion succeeds, False otherwise.
+            
+        Raises:
+            MetadataManagerError: If database operation fails; a
+                                  RetryableError for transient failures
         """
         try:
-            MetadataManager.db.collection(collection).document(document_id).delete()
+            MetadataManager._write_tracking_tags(collection, document_id, None)
+            MetadataManager.invalidate(collection, document_id)
             return True
+        except NotFoundError:
+            raise
         except Exception as e:
-            raise ValueError(f"Error permanently deleting document '{document_id}' from '{collection}': {e}")
+            raise _firestore_error("Failed to hard-delete document", e) from e
 
     @staticmethod
-    def get_distinct_tags(collection: str, include_deleted: bool = False) -> List[str]:
+    def _tag_removal_writes(collection: str, doc_refs: List[Any]) -> List[Tuple[str, Any, Dict[str, Any]]]:
+        """Read the documents' live tags in one get_all and build writes removing them from the tag index."""
+        deltas = Counter()
+        for snapshot in MetadataManager.db().get_all(doc_refs, field_paths=['tags', 'deleted_at']):
+            if snapshot.exists and not _snapshot_field(snapshot, 'deleted_at'):
+                deltas.subtract(set(_snapshot_field(snapshot, 'tags') or []))
+        return [('merge', tag_ref, tag_data)
+                for tag_ref, tag_data in MetadataManager._tag_index_writes(collection, deltas)]
+
+    @staticmethod
+    def soft_delete_many(collection: str, document_ids: List[str]) -> bool:
         """
-        Retrieves a list of all unique tags from documents in the collection.
+        Marks many documents as deleted in atomic WriteBatches.
+        
+        All documents are read up front, and nothing is written unless every
+        one of them exists and is live. Each batch then moves up to
+        BATCH_WRITE_SIZE // 2 documents to the deleted partition together
+        with the tag index updates for those documents, so a failed batch
+        leaves its documents and their tag counts untouched. Batches commit
+        concurrently, so when one fails the others may still be applied.
         
         Args:
             collection: Name of the Firestore collection
-            include_deleted: If True, includes tags from soft-deleted documents
+            document_ids: Unique identifiers of the documents to delete
             
         Returns:
-            List of unique tags sorted alphabetically
+            True if successful
             
         Raises:
-            MetadataManagerError: If database operation fails
+            NotFoundError: If any document doesn't exist; nothing is written
+            ValueError: If any document is already deleted; nothing is written
+            MetadataManagerError: If database operation fails; batches other
+                                  than the failed one may have been applied
         """
         try:
-            query = MetadataManager.db.collection(collection)
-            
-            # Exclude soft-deleted documents unless specified
-            if not include_deleted:
-                query = query.where(filter=FieldFilter('deleted_at', '==', None))
+            collection_ref = MetadataManager._col(collection)
+            deleted_ref = MetadataManager._deleted_col(collection)
+            updates = {
+                'deleted_at': firestore.SERVER_TIMESTAMP,
+                'updated_at': firestore.SERVER_TIMESTAMP
+            }
             
-            # Get only the tags field from all documents
-            docs = query.select(['tags']).stream()
+            doc_ids = list(dict.fromkeys(document_ids))
+            live = [snapshot for snapshot in MetadataManager.db().get_all(
+                        [collection_ref.document(doc_id) for doc_id in doc_ids]) if snapshot.exists]
+            found = {snapshot.id for snapshot in live}
+            absent = [doc_id for doc_id in doc_ids if doc_id not in found]
             
-            # Collect all unique tags
-            unique_tags = set()
-            for doc in docs:
-                tags = doc.to_dict().get('tags', [])
-                if isinstance(tags, (list, set)):
-                    unique_tags.update(tags)
+            deleted = {snapshot.id for snapshot in live if _snapshot_field(snapshot, 'deleted_at')}
+            if absent:
+                deleted.update(snapshot.id for snapshot in MetadataManager.db().get_all(
+                    [deleted_ref.document(doc_id) for doc_id in absent], field_paths=['deleted_at'])
+                    if snapshot.exists)
+                missing = [doc_id for doc_id in absent if doc_id not in deleted]
+                if missing:
+                    raise NotFoundError(f"Documents not found: {', '.join(missing)}")
+            if deleted:
+                raise ValueError(f"Documents already deleted: {', '.join(sorted(deleted))}")
             
-            # Return sorted list of tags
-            return sorted(list(unique_tags))
+            groups = []
+            moves_per_batch = BATCH_WRITE_SIZE // 2
+            for start in range(0, len(live), moves_per_batch):
+                writes, deltas = [], Counter()
+                for snapshot in live[start:start + moves_per_batch]:
+                    current = snapshot.to_dict()
+                    writes.extend(_partition_writes(snapshot.reference, deleted_ref.document(snapshot.id),
+                                                    True, current, updates))
+                    deltas.update(_tag_deltas(current, updates))
+                writes.extend(('merge', tag_ref, tag_data)
+                              for tag_ref, tag_data in MetadataManager._tag_index_writes(collection, deltas))
+                groups.append(writes)
             
+            MetadataManager._commit_write_groups(groups)
+            return True
+        except (NotFoundError, ValueError):
+            raise
         except Exception as e:
-            raise MetadataManagerError(f"Failed to get distinct tags: {str(e)}")
+            raise _firestore_error("Failed to soft-delete documents", e) from e
+        finally:
+            for doc_id in document_ids:
+                MetadataManager.invalidate(collection, doc_id)
+
+    @staticmethod
+    def hard_delete_many(collection: str, document_ids: List[str]) -> bool:
+        """
+        Permanently deletes many documents in WriteBatches of BATCH_WRITE_SIZE.
+        
+        Args:
+            collection: Name of the Firestore collection
+            document_ids: Unique identifiers of the documents to delete
+            
+        Returns:
+            True if successful
+            
+        Raises:
+            MetadataManagerError: If database operation fails
+        """
+        try:
+            collection_ref = MetadataManager._col(collection)
+            deleted_ref = MetadataManager._deleted_col(collection)
+            writes = [('delete', collection_ref.document(doc_id), None) for doc_id in document_ids]
+            tag_writes = MetadataManager._tag_removal_writes(collection, [ref for _, ref, _ in writes])
+            writes.extend(('delete', deleted_ref.document(doc_id), None) for doc_id in document_ids)
+            MetadataManager._commit_in_batches(writes + tag_writes)
+            return True
+        except Exception as e:
+            raise _firestore_error("Failed to delete documents", e) from e
+        finally:
+            for doc_id in document_ids:
+                MetadataManager.invalidate(collection, doc_id)
+
+    @staticmethod
+    def get_distinct_tags(collection: str, include_deleted: bool = False) -> List[str]:
+        """
+        Retrieves a list of all unique tags from documents in the collection.
+        
+        Tags of live documents are read from the collection's tag index, one
+        small document per tag, instead of scanning every document. Including
+        soft-deleted documents adds a scan of the deleted partition only.
+        
+        Args:
+            collection: Name of the Firestore collection
+            include_deleted: If True, includes tags from soft-deleted documents
+            
+        Returns:
+            List of unique tags sorted alphabetically
+            
+        Raises:
+            MetadataManagerError: If database operation fails
+        """
+        try:
+            query = MetadataManager._tag_index(collection).where(filter=FieldFilter('count', '>', 0))
+            tags = {doc.get('tag') for doc in query.select(['tag']).stream()}
+            if include_deleted:
+                tags.update(MetadataManager._scan_tag_counts(MetadataManager._deleted_col(collection)))
+            return sorted(tags)
+            
+        except Exception as e:
+            raise _firestore_error("Failed to get distinct tags", e) from e
+
+    @staticmethod
+    def _scan_tag_counts(collection_ref: firestore.CollectionReference) -> Counter:
+        """Count documents per tag by scanning the tags field of every document in a collection."""
+        tag_counts = Counter()
+        for doc in collection_ref.select(['tags']).stream():
+            tags = _snapshot_field(doc, 'tags')
+            if isinstance(tags, (list, set)):
+                tag_counts.update(set(tags))
+        return tag_counts
+
+    @staticmethod
+    def rebuild_tag_index(collection: str) -> int:
+        """
+        Rebuilds a collection's tag index from its documents.
+        
+        Run once to backfill the index for existing data, or to repair counts
+        after writes made outside MetadataManager. Tags no longer in use are
+        removed from the index.
+        
+        Args:
+            collection: Name of the Firestore collection
+            
+        Returns:
+            Number of distinct tags in the rebuilt index
+            
+        Raises:
+            MetadataManagerError: If database operation fails
+        """
+        try:
+            tag_counts = MetadataManager._scan_tag_counts(MetadataManager._col(collection))
+            tag_index = MetadataManager._tag_index(collection)
+            
+            tag_ids = {quote(tag, safe='') for tag in tag_counts}
+            writes = [('delete', doc.reference, None) for doc in tag_index.select([]).stream()
+                      if doc.id not in tag_ids]
+            writes.extend(
+                ('set', tag_index.document(quote(tag, safe='')), {'tag': tag, 'count': count})
+                for tag, count in tag_counts.items()
+            )
+            MetadataManager._commit_in_batches(writes)
+            return len(tag_counts)
+        except Exception as e:
+            raise _firestore_error("Failed to rebuild tag index", e) from e
+
+    @staticmethod
+    def partition_deleted(collection: str) -> int:
+        """
+        Moves soft-deleted documents left in a collection into its deleted
+        partition.
+        
+        api/deploy.sh runs this for every configured collection around each
+        deploy, since live listings and counts don't filter on deleted_at.
+        Until it has run, point reads still hide such documents by their
+        deleted_at, but listings would include them.
+        
+        Args:
+            collection: Name of the Firestore collection
+            
+        Returns:
+            Number of documents moved
+            
+        Raises:
+            MetadataManagerError: If database operation fails
+        """
+        try:
+            deleted_ref = MetadataManager._deleted_col(collection)
+            query = MetadataManager._col(collection).where(filter=FieldFilter('deleted_at', '!=', None))
+            
+            writes = []
+            for doc in query.stream():
+                writes.append(('set', deleted_ref.document(doc.id), doc.to_dict()))
+                writes.append(('delete', doc.reference, None))
+            MetadataManager._commit_in_batches(writes)
+            
+            for _, doc_ref, _ in writes[1::2]:
+                MetadataManager.invalidate(collection, doc_ref.id)
+            return len(writes) // 2
+        except Exception as e:
+            raise _firestore_error("Failed to partition deleted documents", e) from e
+
+class AsyncMetadataManager:
+    """
+    Async mirror of MetadataManager on firestore.AsyncClient, for callers
+    that issue many independent Firestore requests concurrently.
+    
+    Writes keep the same tag index, and opted-in reads share the same read
+    cache, as MetadataManager; failures raise the same MetadataManagerError
+    types.
+    
+    Key methods:
+    - create_document(collection, data, custom_timestamps=None, doc_id=None,
+                      return_server_state=False) -> dict
+    - read_document(collection, document_id, include_deleted=False,
+                    ttl_seconds=None) -> Optional[dict]
+    - read_many(collection, document_ids, include_deleted=False,
+                ttl_seconds=None) -> List[Optional[dict]]
+    - update_document(collection, document_id, updates, include_deleted=False,
+                      return_server_state=False) -> dict
+    - soft_delete(collection, document_id) -> bool
+    - restore_document(collection, document_id) -> bool
+    - hard_delete_document(collection, document_id) -> bool
+    - get_distinct_tags(collection) -> List[str]
+    - configure(client) -> None
+    - count(collection, include_deleted=False, filters=None, order_by=None,
+            descending=True) -> int
+    - query(collection, include_deleted=False, order_by='created_at', descending=True,
+            filters=None, offset=0, limit=None, fields=None, start_after=None) -> List[dict]
+    - list_documents(collection, include_deleted=False, order_by='created_at',
+                     descending=True, filters=None, page=1, per_page=20, fields=None,
+                     start_after=None) -> dict
+    """
+    
+    # Injected client, if any; otherwise the shared client is created on first use
+    _db: Optional[firestore.AsyncClient] = None
+
+    @classmethod
+    def db(cls) -> firestore.AsyncClient:
+        """Async Firestore client used by AsyncMetadataManager, created on first use."""
+        if cls._db is None:
+            cls._db = get_async_firestore_client()
+        return cls._db
+
+    @classmethod
+    def configure(cls, client: firestore.AsyncClient) -> None:
+        """
+        Sets the async Firestore client AsyncMetadataManager uses.
+        
+        Args:
+            client: Async Firestore client to use from now on
+        """
+        cls._db = client
+
+    @staticmethod
+    def _tag_index(collection: str) -> Any:
+        """Collection holding one document per tag with its live document count."""
+        return AsyncMetadataManager.db().collection(f"{collection}{TAG_INDEX_SUFFIX}")
+
+    @staticmethod
+    def _partitions(collection: str, include_deleted: bool) -> List[Any]:
+        """Collections a read covers: the live one, plus the deleted partition if included."""
+        names = [collection, f"{collection}{DELETED_SUFFIX}"] if include_deleted else [collection]
+        return [AsyncMetadataManager.db().collection(name) for name in names]
+
+    @staticmethod
+    async def _write_tracking_tags(collection: str, document_id: str, updates: Optional[Dict[str, Any]],
+                                   check: Optional[Callable[[Dict[str, Any]], None]] = None) -> bool:
+        """Async counterpart to MetadataManager._write_tracking_tags."""
+        live_ref, deleted_ref = [collection_ref.document(document_id)
+                                 for collection_ref in AsyncMetadataManager._partitions(collection, True)]
+        
+        @firestore.async_transactional
+        async def run(transaction) -> bool:
+            snapshot = await live_ref.get(transaction=transaction)
+            in_live = snapshot.exists
+            if not in_live:
+                snapshot = await deleted_ref.get(transaction=transaction)
+            if not snapshot.exists:
+                if updates is None:
+                    return False
+                raise NotFoundError(f"Document {document_id} not found")
+            
+            current = snapshot.to_dict()
+            if check:
+                check(current)
+            
+            tag_index = AsyncMetadataManager._tag_index(collection)
+            writes = _partition_writes(live_ref, deleted_ref, in_live, current, updates)
+            writes.extend(('merge', tag_ref, tag_data) for tag_ref, tag_data
+                          in _tag_count_writes(tag_index, _tag_deltas(current, updates)))
+            for operation, doc_ref, data in writes:
+                _apply_write(transaction, operation, doc_ref, data)
+            return True
+        
+        return await run(AsyncMetadataManager.db().transaction())
+
+    @staticmethod
+    async def create_document(collection: str, data: Dict[str, Any],
+                              custom_timestamps: Optional[Dict[str, datetime]] = None,
+                              doc_id: Optional[str] = None,
+                              return_server_state: bool = False) -> Dict[str, Any]:
+        """
+        Creates a new document, as MetadataManager.create_document.
+        
+        Args:
+            collection: Name of the Firestore collection
+            data: Document data to store
+            custom_timestamps: Optional dict with custom timestamp values
+            doc_id: Optional document ID; a random ID is generated if omitted
+            return_server_state: If True, read the document back after the
+                                 write and return it as stored
+            
+        Returns:
+            Dictionary containing the document data and its ID, with
+            client-clock approximations of the stored server timestamps
+            
+        Raises:
+            ValueError: If collection is empty or data is invalid
+            AlreadyExistsError: If doc_id already exists
+            MetadataManagerError: If database operation fails
+        """
+        if not collection or not isinstance(data, dict):
+            raise ValueError("Invalid collection name or data format")
+            
+        try:
+            doc_ref = AsyncMetadataManager.db().collection(collection).document(doc_id)
+            doc_data = MetadataManager._with_timestamps(doc_ref.id, data, custom_timestamps)
+            
+            # Create the document and count its tags in one atomic commit
+            batch = AsyncMetadataManager.db().batch()
+            batch.create(doc_ref, MetadataManager._server_timestamped(doc_data, custom_timestamps))
+            tag_index = AsyncMetadataManager._tag_index(collection)
+            for tag_ref, tag_data in _tag_count_writes(tag_index, Counter(_live_tags(doc_data))):
+                batch.set(tag_ref, tag_data, merge=True)
+            await batch.commit()
+            
+            if return_server_state:
+                return await AsyncMetadataManager.read_document(collection, doc_ref.id, include_deleted=True)
+            return doc_data
+        except Exception as e:
+            raise _firestore_error("Failed to create document", e) from e
+
+    @staticmethod
+    async def read_document(collection: str, document_id: str, include_deleted: bool = False,
+                            ttl_seconds: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Retrieves a document by ID, as MetadataManager.read_document.
+        
+        Reads given a ttl_seconds share MetadataManager's read cache, so
+        writes made through either class invalidate them.
+        
+        Args:
+            collection: Name of the Firestore collection
+            document_id: Document's unique identifier
+            include_deleted: If True, returns document even if soft-deleted
+            ttl_seconds: Maximum age of a cached read to accept; by default
+                         the cache is neither read nor filled
+            
+        Returns:
+            Document data dictionary or None if not found or soft-deleted
+            
+        Raises:
+            ValueError: If collection or document_id is invalid
+            MetadataManagerError: If database operation fails
+        """
+        if not collection or not document_id:
+            raise ValueError("Collection and document_id must not be empty")
+            
+        key = (collection, document_id)
+        data = None
+        if ttl_seconds and not include_deleted:
+            with _READ_CACHE_LOCK:
+                entry = _READ_CACHE.get(key)
+            if entry and time.monotonic() - entry[0] < ttl_seconds:
+                data = entry[1]
+            
+        if data is None:
+            try:
+                live_ref, deleted_ref = AsyncMetadataManager._partitions(collection, True)
+                doc = await live_ref.document(document_id).get()
+                if doc.exists:
+                    data = doc.to_dict()
+                    if ttl_seconds:
+                        with _READ_CACHE_LOCK:
+                            _READ_CACHE[key] = (time.monotonic(), data)
+                else:
+                    if include_deleted:
+                        doc = await deleted_ref.document(document_id).get()
+                    if not doc.exists:
+                        return None
+                    data = doc.to_dict()
+            except Exception as e:
+                raise _firestore_error("Failed to read document", e) from e
+        
+        if not include_deleted and data.get('deleted_at'):
+            return None
+        return data.copy()
+
+    @staticmethod
+    async def read_many(collection: str, document_ids: List[str], include_deleted: bool = False,
+                        ttl_seconds: Optional[float] = None) -> List[Optional[Dict[str, Any]]]:
+        """
+        Reads many documents concurrently on the event loop.
+        
+        Args:
+            collection: Name of the Firestore collection
+            document_ids: Unique identifiers of the documents to read
+            include_deleted: If True, returns documents even if soft-deleted
+            ttl_seconds: Maximum age of a cached read to accept, as for
+                         read_document
+            
+        Returns:
+            Document data (or None, as for read_document) for each ID, in order
+            
+        Raises:
+            MetadataManagerError: If database operation fails
+        """
+        return list(await asyncio.gather(*(
+            AsyncMetadataManager.read_document(collection, doc_id, include_deleted, ttl_seconds)
+            for doc_id in document_ids
+        )))
+
+    @staticmethod
+    async def update_document(collection: str, document_id: str, updates: Dict[str, Any],
+                              include_deleted: bool = False, return_server_state: bool = False) -> Dict[str, Any]:
+        """
+        Updates specific fields in an existing document, as
+        MetadataManager.update_document.
+        
+        Args:
+            collection: Name of the Firestore collection
+            document_id: Document's unique identifier
+            updates: Dictionary of field paths and values (or transforms) to update
+            include_deleted: If True, soft-deleted documents are updated too
+            return_server_state: If True, read the document back after the
+                                 write and return it as stored
+            
+        Returns:
+            The applied updates with the document ID and a client-clock
+            updated_at, or the stored document with return_server_state=True
+            
+        Raises:
+            ValueError: If required parameters are missing
+            NotFoundError: If document doesn't exist, or is soft-deleted and
+                           include_deleted is not set
+            MetadataManagerError: If database operation fails
+        """
+        if not collection or not document_id or not updates:
+            raise ValueError("Missing required parameters")
+            
+        try:
+            update_data = {**updates, 'updated_at': firestore.SERVER_TIMESTAMP}
+            
+            if 'tags' in updates or 'deleted_at' in updates:
+                def _check(current: Dict[str, Any]) -> None:
+                    if not include_deleted and current.get('deleted_at'):
+                        raise NotFoundError(f"Document {document_id} not found")
+                
+                await AsyncMetadataManager._write_tracking_tags(collection, document_id, update_data, _check)
+            else:
+                live_ref, deleted_ref = AsyncMetadataManager._partitions(collection, True)
+                try:
+                    await live_ref.document(document_id).update(update_data)
+                except NotFound:
+                    if not include_deleted:
+                        raise
+                    await deleted_ref.document(document_id).update(update_data)
+            MetadataManager.invalidate(collection, document_id)
+            
+            if return_server_state:
+                return await AsyncMetadataManager.read_document(collection, document_id, include_deleted=True)
+            return {**_without_transforms(updates), 'id': document_id, 'updated_at': datetime.now(timezone.utc)}
+        except NotFound as e:
+            raise NotFoundError(f"Document {document_id} not found") from e
+        except NotFoundError:
+            raise
+        except Exception as e:
+            raise _firestore_error("Failed to update document", e) from e
+
+    @staticmethod
+    async def soft_delete(collection: str, document_id: str) -> bool:
+        """
+        Marks a document as deleted without removing it, as
+        MetadataManager.soft_delete.
+        
+        Args:
+            collection: Name of the Firestore collection
+            document_id: Document's unique identifier
+            
+        Returns:
+            True if successful
+            
+        Raises:
+            NotFoundError: If document doesn't exist
+            ValueError: If document is already deleted
+            MetadataManagerError: If database operation fails
+        """
+        try:
+            def _check(current: Dict[str, Any]) -> None:
+                if current.get('deleted_at'):
+                    raise ValueError(f"Document {document_id} is already deleted")
+            
+            await AsyncMetadataManager._write_tracking_tags(collection, document_id, {
+                'deleted_at': firestore.SERVER_TIMESTAMP,
+                'updated_at': firestore.SERVER_TIMESTAMP
+            }, _check)
+            MetadataManager.invalidate(collection, document_id)
+            return True
+        except NotFound as e:
+            raise NotFoundError(f"Document {document_id} not found") from e
+        except NotFoundError:
+            raise
+        except Exception as e:
+            raise _firestore_error("Failed to soft-delete document", e) from e
+
+    @staticmethod
+    async def restore_document(collection: str, document_id: str) -> bool:
+        """
+        Restores a soft-deleted document, as MetadataManager.restore_document.
+        
+        Args:
+            collection: Name of the Firestore collection
+            document_id: Document's unique identifier
+            
+        Returns:
+            True if successful
+            
+        Raises:
+            NotFoundError: If document doesn't exist
+            ValueError: If document isn't deleted
+            MetadataManagerError: If database operation fails
+        """
+        try:
+            def _check(current: Dict[str, Any]) -> None:
+                if not current.get('deleted_at'):
+                    raise ValueError(f"Document {document_id} is not deleted")
+            
+            await AsyncMetadataManager._write_tracking_tags(collection, document_id, {
+                'deleted_at': None,
+                'updated_at': firestore.SERVER_TIMESTAMP
+            }, _check)
+            MetadataManager.invalidate(collection, document_id)
+            return True
+        except NotFound as e:
+            raise NotFoundError(f"Document {document_id} not found") from e
+        except NotFoundError:
+            raise
+        except Exception as e:
+            raise _firestore_error("Failed to restore document", e) from e
+
+    @staticmethod
+    async def hard_delete_document(collection: str, document_id: str) -> bool:
+        """
+        Permanently deletes a document, as MetadataManager.hard_delete_document.
+        
+        Args:
+            collection (str): The name of the Firestore collection.
+            document_id (str): The unique identifier of the document.
+
+        Returns:
+            bool: True if the deletion succeeds, False otherwise.
+            
+        Raises:
+            MetadataManagerError: If database operation fails; a
+                                  RetryableError for transient failures
+        """
+        try:
+            await AsyncMetadataManager._write_tracking_tags(collection, document_id, None)
+            MetadataManager.invalidate(collection, document_id)
+            return True
+        except NotFoundError:
+            raise
+        except Exception as e:
+            raise _firestore_error("Failed to hard-delete document", e) from e
+
+    @staticmethod
+    async def get_distinct_tags(collection: str) -> List[str]:
+        """
+        Retrieves the sorted unique tags of live documents from the
+        collection's tag index.
+        
+        Args:
+            collection: Name of the Firestore collection
+            
+        Returns:
+            List of unique tags sorted alphabetically
+            
+        Raises:
+            MetadataManagerError: If database operation fails
+        """
+        try:
+            query = AsyncMetadataManager._tag_index(collection).where(filter=FieldFilter('count', '>', 0))
+            return sorted([doc.get('tag') async for doc in query.select(['tag']).stream()])
+        except Exception as e:
+            raise _firestore_error("Failed to get distinct tags", e) from e
+
+    @staticmethod
+    async def count(collection: str, include_deleted: bool = False,
+                    filters: Optional[List[Dict[str, Any]]] = None,
+                    order_by: Optional[str] = None, descending: bool = True) -> int:
+        """
+        Counts matching documents with server-side aggregations, as
+        MetadataManager.count_documents.
+        
+        Args:
+            collection: Name of the Firestore collection
+            include_deleted: If True, includes soft-deleted documents
+            filters: Filter dictionaries, as for MetadataManager.list_documents
+            order_by: If given, only documents having this field are counted
+            descending: Sort order direction the count's index is built for
+            
+        Returns:
+            Number of matching documents
+            
+        Raises:
+            ValueError: If a filter is malformed
+            MetadataManagerError: If database operation fails
+        """
+        if not _check_filters(filters):
+            return 0
+            
+        try:
+            queries = [_build_query(collection_ref, filters)
+                       for collection_ref in AsyncMetadataManager._partitions(collection, include_deleted)]
+            if order_by:
+                queries = [_order(query, order_by, descending) for query in queries]
+            results = await asyncio.gather(*(query.count(alias='total').get() for query in queries))
+            return sum(result[0][0].value for result in results)
+        except Exception as e:
+            raise _firestore_error("Failed to count documents", e) from e
+
+    @staticmethod
+    async def query(
+        collection: str,
+        include_deleted: bool = False,
+        order_by: str = 'created_at',
+        descending: bool = True,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        start_after: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retrieves one window of a filtered and ordered query.
+        
+        Args:
+            collection: Name of the Firestore collection
+            include_deleted: If True, includes soft-deleted documents
+            order_by: Field to sort by
+            descending: Sort order direction
+            filters: Filter dictionaries, as for MetadataManager.list_documents
+            offset: Number of matching documents to skip
+            limit: Maximum number of documents to return
+            fields: Fields to return for each document (default: all)
+            start_after: Cursor to resume after, as for
+                         MetadataManager.list_documents
+            
+        Returns:
+            List of document dictionaries
+            
+        Raises:
+            ValueError: If a filter is malformed
+            MetadataManagerError: If database operation fails
+        """
+        if not _check_filters(filters):
+            return []
+            
+        try:
+            queries = [_order(_build_query(collection_ref, filters), order_by, descending)
+                       for collection_ref in AsyncMetadataManager._partitions(collection, include_deleted)]
+            if fields is not None:
+                # Merging partitions and building cursors need the sort field in every item
+                selected = fields if order_by in fields else [*fields, order_by]
+                queries = [query.select(selected) for query in queries]
+            if start_after is not None:
+                queries = [query.start_after(_query_cursor(start_after)) for query in queries]
+            
+            if len(queries) == 1:
+                query = queries[0]
+                if offset:
+                    query = query.offset(offset)
+                if limit:
+                    query = query.limit(limit)
+                return await _collect(query)
+            
+            # Any partition may hold the whole window, so read that much of each
+            if limit:
+                queries = [query.limit(offset + limit) for query in queries]
+            streams = await asyncio.gather(*(_collect(query) for query in queries))
+            return _merge_window(streams, order_by, descending, offset, limit)
+        except FailedPrecondition as e:
+            raise MetadataManagerError(
+                f"Failed to query documents: {e.message}; create the missing index with: "
+                f"{_index_hint(collection, filters, order_by, descending)}"
+            ) from e
+        except Exception as e:
+            raise _firestore_error("Failed to query documents", e) from e
+
+    @staticmethod
+    async def list_documents(
+        collection: str,
+        include_deleted: bool = False,
+        order_by: str = 'created_at',
+        descending: bool = True,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        page: int = 1,
+        per_page: int = 20,
+        fields: Optional[List[str]] = None,
+        start_after: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Retrieves one page of documents, running the count and the page query
+        concurrently on the event loop.
+        
+        Args:
+            collection: Name of the Firestore collection
+            include_deleted: If True, includes soft-deleted documents
+            order_by: Field to sort by
+            descending: Sort order direction
+            filters: Filter dictionaries, as for MetadataManager.list_documents
+            page: Page number (starting from 1)
+            per_page: Number of items per page
+            fields: Fields to return for each document (default: all)
+            start_after: Cursor ({order_by: value, 'id': document_id}) to
+                         resume after, as returned in next_cursor; takes
+                         the place of page
+            
+        Returns:
+            Dictionary with items, total, page, per_page, pages and
+            next_cursor, as returned by MetadataManager.list_documents
+            
+        Raises:
+            MetadataManagerError: If database operation fails
+        """
+        offset = 0 if start_after is not None else (page - 1) * per_page
+        total_items, items = await asyncio.gather(
+            AsyncMetadataManager.count(collection, include_deleted, filters, order_by, descending),
+            AsyncMetadataManager.query(
+                collection, include_deleted, order_by, descending, filters,
+                offset=offset, limit=per_page, fields=fields, start_after=start_after
+            )
+        )
+        
+        next_cursor = None
+        if len(items) == per_page:
+            next_cursor = {order_by: items[-1][order_by], 'id': items[-1]['id']}
+        
+        return {
+            'items': items,
+            'total': total_items,
+            'page': page,
+            'per_page': per_page,
+            'pages': (total_items + per_page - 1) // per_page,
+            'next_cursor': next_cursor
+        }
+
+def _reset_after_fork() -> None:
+    """Drop the clients, collection references and cached reads a forked child inherited."""
+    global _READ_CACHE_LOCK
+    # Another thread of the parent may have held the lock when it forked
+    _READ_CACHE_LOCK = threading.Lock()
+    MetadataManager.configure(None)
+    AsyncMetadataManager.configure(None)
 
+# A forked worker must not reuse the parent's gRPC channels, so it builds its own clients
+os.register_at_fork(after_in_child=_reset_after_fork)
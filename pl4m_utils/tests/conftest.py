@@ -1,11 +1,71 @@
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, create_autospec
 from google.cloud import storage
-from datetime import datetime
+from functools import lru_cache
+import pl4m_utils.content_manager as cm_module
+from pl4m_utils.config import get_bucket_name
+from pl4m_utils.metadata_manager import AsyncMetadataManager, MetadataManager
+
+# Shared MetadataManager mock configuration; each test still gets a fresh
+# mock (a copied mock would share its child mocks and their call records)
+_MOCK_DOC = {
+    'id': 'test-id',
+    'title': 'Test Post',
+    'description': 'Test Description',
+    'tags': ['test']
+}
+_MOCK_MM_RESULTS = {
+    'soft_delete.return_value': True,
+    'hard_delete_document.return_value': True,
+    'restore_document.return_value': True
+}
+
+# Sample values for the metadata fields content types require or allow
+_SAMPLE_METADATA = {
+    'title': 'Test Title',
+    'description': 'Test content',
+    'tags': ['test', 'fixture']
+}
+
+@lru_cache(maxsize=None)
+def _mock_doc(content_type, valid_extension):
+    """Complete mock document for a content type, built once and shared; tests must not mutate it."""
+    bucket = get_bucket_name()
+    blob_path = f'2024/03/01/{content_type}/test{valid_extension}'
+    return {
+        **_MOCK_DOC,
+        'bucket': bucket,
+        'blob_path': blob_path,
+        'gcs_path': f'gs://{bucket}/{blob_path}'
+    }
+
+@pytest.fixture(scope="session")
+def metadata_manager():
+    """Provides an instance of MetadataManager on live Firestore, shared by the whole run."""
+    # The Firestore client behind it is itself created once per process
+    return MetadataManager()
 
 @pytest.fixture
-def mock_storage_client():
-    """Provides a mocked GCS client."""
+def fake_firestore():
+    """Points MetadataManager at a mocked Firestore client for the duration of a test."""
+    previous = MetadataManager._db
+    client = MagicMock()
+    MetadataManager.configure(client)
+    yield client
+    # Also drops the collection references and reads cached from the mock
+    MetadataManager.configure(previous)
+
+@pytest.fixture
+def fake_async_firestore():
+    """Points AsyncMetadataManager at a mocked async Firestore client for the duration of a test."""
+    previous = AsyncMetadataManager._db
+    client = MagicMock()
+    AsyncMetadataManager.configure(client)
+    yield client
+    AsyncMetadataManager.configure(previous)
+
+def _fake_storage_client():
+    """Build a mocked GCS client."""
     mock_client = MagicMock(spec=storage.Client)
     
     # Setup mock bucket and blob
@@ -35,18 +95,56 @@ def mock_storage_client():
     
     return mock_client
 
+# Built once at import; no test mutates it
+_FAKE_GCS_CLIENT = _fake_storage_client()
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_gcs_client():
+    """Serve the shared fake GCS client to every ContentManager for the whole run."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(cm_module, 'get_storage_client', lambda: _FAKE_GCS_CLIENT)
+        yield _FAKE_GCS_CLIENT
+
 @pytest.fixture
-def mock_metadata():
-    """Provides base metadata for content tests."""
-    return {
-        'tags': ['test', 'fixture'],
-        'description': 'Test content',
-        'title': 'Test Title',  # Add required fields
-        'created_at': datetime.utcnow(),
-        'updated_at': datetime.utcnow(),
-        'deleted_at': None,
-        'id': 'test-id',
-        'bucket': 'tylers-platform-docs',
-        'blob_path': '2024/03/test.txt',
-        'gcs_path': 'gs://tylers-platform-docs/2024/03/test.txt'
-    } 
\ No newline at end of file
+def manager_spec(request):
+    """The ManagerSpec a test is parametrized with (indirectly, see test_content_manager)."""
+    return request.param
+
+@pytest.fixture
+def mock_metadata_manager(manager_spec, monkeypatch):
+    """Mock the MetadataManager instance a ContentManager creates."""
+    # Configure mock methods with complete metadata
+    mock_doc = _mock_doc(manager_spec.content_type, manager_spec.valid_extension)
+    # Deliberately not autospecced: speccing scans the whole class on every
+    # test. Tests that need signature checking use autospec_metadata_manager.
+    mock_mm = MagicMock()
+    mock_mm.return_value.configure_mock(**_MOCK_MM_RESULTS, **{
+        f'{method}.return_value': mock_doc
+        for method in ('create_document', 'read_document', 'update_document')
+    })
+    monkeypatch.setattr(cm_module, 'MetadataManager', mock_mm)
+    return mock_mm.return_value
+
+@pytest.fixture(scope="session")
+def _autospec_mm_template():
+    """Autospec of a MetadataManager instance, built once per run."""
+    return create_autospec(MetadataManager, instance=True)
+
+@pytest.fixture
+def autospec_metadata_manager(_autospec_mm_template, monkeypatch):
+    """Signature-checked MetadataManager mock, reset for each test."""
+    # Reset rather than copy: a copied mock would share its child mocks
+    _autospec_mm_template.reset_mock(return_value=True, side_effect=True)
+    monkeypatch.setattr(cm_module, 'MetadataManager', lambda: _autospec_mm_template)
+    return _autospec_mm_template
+
+@pytest.fixture
+def manager(manager_spec, mock_metadata_manager):
+    """Initialize the manager under test with mocked dependencies."""
+    return manager_spec.factory()
+
+@pytest.fixture
+def valid_metadata(manager):
+    """Metadata with every required field of the manager's content type."""
+    allowed = manager.required_metadata | manager.optional_metadata
+    return {field: value for field, value in _SAMPLE_METADATA.items() if field in allowed}
@@ -1,158 +1,226 @@
+import asyncio
+import os
 import pytest
-from unittest.mock import patch, MagicMock
-from pl4m_utils.content_manager import ContentManager, ContentManagerError
+from collections import namedtuple
 from datetime import datetime
-
-class TestContentManagerBase:
-    """
-    Base test class for content managers.
-    Not meant to be run directly - subclass for specific manager tests.
-    """
+from functools import partial
+from unittest.mock import AsyncMock
+from pl4m_utils import BlogManager, ContentManager, ContentManagerError, DocumentManager, ImageManager, MetadataManager
+from pl4m_utils.api.content_flask_bp import _get_manager
+from pl4m_utils.config import get_bucket_name, get_collection_name
+
+# How to build each manager under test, and what it should accept
+ManagerSpec = namedtuple('ManagerSpec', ['factory', 'content_type', 'valid_extension', 'mime_type'])
+
+DOCUMENT_SPEC = ManagerSpec(partial(ContentManager, content_type="documents"), "documents", ".pdf", "application/pdf")
+IMAGE_SPEC = ManagerSpec(partial(ContentManager, content_type="images"), "images", ".jpg", "image/jpeg")
+BLOG_SPEC = ManagerSpec(partial(ContentManager, content_type="blog"), "blog", ".md", "text/markdown")
+
+MANAGER_SPECS = [
+    pytest.param(DOCUMENT_SPEC, id="documents"),
+    pytest.param(IMAGE_SPEC, id="images"),
+    pytest.param(BLOG_SPEC, id="blog")
+]
+
+# Run a test once for every content type
+all_managers = pytest.mark.parametrize("manager_spec", MANAGER_SPECS, indirect=True)
+
+@pytest.fixture(scope="module")
+def readonly_manager():
+    """ContentManager shared by tests that neither mutate it nor touch metadata."""
+    return DOCUMENT_SPEC.factory()
+
+@all_managers
+def test_generate_upload_url(manager, manager_spec):
+    """Test generating upload URL."""
+    url = manager.generate_upload_url(f"test{manager_spec.valid_extension}", allow_overwrite=True)
+    assert url == "https://fake-signed-url"
+
+@all_managers
+def test_generate_upload_url_existing_file(manager, manager_spec):
+    """Test generating upload URL for a path that is already taken."""
+    with pytest.raises(ContentManagerError, match="File already exists"):
+        manager.generate_upload_url(f"test{manager_spec.valid_extension}")
+
+@all_managers
+def test_generate_upload_url_invalid_extension(manager):
+    """Test generating upload URL with invalid extension."""
+    with pytest.raises(ContentManagerError, match="Invalid file extension"):
+        manager.generate_upload_url("test.invalid")
+
+@pytest.fixture(params=[
+    (lambda metadata: {k: v for k, v in metadata.items() if k != 'tags'}, "Missing required metadata fields"),
+    (lambda metadata: {**metadata, 'tags': 'not a list'}, "'tags' must be of type"),
+    (lambda metadata: {**metadata, 'unknown': 'x'}, "Invalid metadata fields"),
+    (lambda metadata: None, "must be a dictionary")
+], ids=["no-tags", "bad-tags", "unknown-field", "none"])
+def invalid_metadata(request, valid_metadata):
+    """Invalid metadata and the error message it should be rejected with."""
+    make_invalid, message = request.param
+    return make_invalid(valid_metadata), message
+
+@all_managers
+def test_validate_metadata(manager, valid_metadata):
+    """Test metadata validation."""
+    manager._validate_metadata(valid_metadata)
+
+@all_managers
+def test_validate_metadata_invalid(manager, invalid_metadata):
+    """Test metadata validation rejects invalid metadata."""
+    metadata, message = invalid_metadata
+    with pytest.raises(ValueError, match=message):
+        manager._validate_metadata(metadata)
+
+@all_managers
+@pytest.mark.parametrize("hard_delete", [False, True], ids=["soft", "hard"])
+def test_delete_content(manager, mock_metadata_manager, hard_delete):
+    """Test soft and hard content deletion."""
+    assert manager.delete_content('test-id', hard_delete=hard_delete) is True
+    if hard_delete:
+        mock_metadata_manager.hard_delete_document.assert_called_once_with(manager.collection, 'test-id')
+    else:
+        mock_metadata_manager.soft_delete.assert_called_once_with(manager.collection, 'test-id')
+
+@all_managers
+def test_hard_delete_missing_content(manager, mock_metadata_manager):
+    """Test hard deleting content that does not exist."""
+    mock_metadata_manager.read_document.return_value = None
+    with pytest.raises(ContentManagerError, match="not found"):
+        manager.delete_content('test-id', hard_delete=True)
+    mock_metadata_manager.hard_delete_document.assert_not_called()
+
+@all_managers
+def test_restore_content(manager):
+    """Test content restoration."""
+    assert manager.restore_content('test-id') is True
+
+@all_managers
+def test_update_metadata_protected_field(manager):
+    """Test that system-managed fields cannot be updated."""
+    with pytest.raises(ValueError, match="protected fields"):
+        manager.update_metadata('test-id', {'blob_path': 'elsewhere'})
+
+@pytest.mark.parametrize("call", [
+    lambda manager: manager.delete_content('test-id'),
+    lambda manager: manager.restore_content('test-id'),
+    lambda manager: manager.update_metadata('test-id', {'title': 'New'})
+], ids=["soft-delete", "restore", "update-metadata"])
+def test_metadata_manager_signatures(autospec_metadata_manager, call):
+    """Test that ContentManager calls MetadataManager with valid signatures."""
+    call(DOCUMENT_SPEC.factory())
+    assert len(autospec_metadata_manager.mock_calls) == 1
+
+def test_init():
+    """Test ContentManager initialization."""
+    manager = ContentManager(content_type="documents")
+    assert manager.content_type == "documents"
+    assert manager.collection == get_collection_name("documents")
+    assert manager.bucket == get_bucket_name()
+    assert manager.valid_extensions == {'.pdf'}
+
+def test_init_undefined_content_type():
+    """Test ContentManager rejects content types missing from the configuration."""
+    with pytest.raises(ValueError, match="Undefined content type"):
+        ContentManager(content_type="videos")
+
+@pytest.mark.parametrize("manager_class, content_type", [
+    (DocumentManager, "documents"),
+    (ImageManager, "images"),
+    (BlogManager, "blog")
+])
+def test_legacy_aliases(manager_class, content_type):
+    """Test the legacy manager classes map to their content types."""
+    assert manager_class().content_type == content_type
+
+def test_parse_gcs_path():
+    """Test GCS path parsing."""
+    bucket, path = ContentManager._parse_gcs_path("gs://test-bucket/path/to/file.txt")
+    assert bucket == "test-bucket"
+    assert path == "path/to/file.txt"
+
+    with pytest.raises(ValueError, match="must start with gs://"):
+        ContentManager._parse_gcs_path("invalid://path")
+
+def test_generate_file_path(readonly_manager):
+    """Test file path generation."""
+    path = readonly_manager._generate_file_path("test.pdf", datetime(2024, 3, 5))
+    assert path == "2024/03/05/documents/test.pdf"
+
+    with pytest.raises(ValueError, match="Invalid filename"):
+        readonly_manager._generate_file_path("nested/test.pdf")
+
+def test_validate_extension(readonly_manager):
+    """Test file extension validation."""
+    readonly_manager._validate_extension("test.pdf")
+    readonly_manager._validate_extension("TEST.PDF")
+
+    with pytest.raises(ValueError, match="Invalid file extension"):
+        readonly_manager._validate_extension("test.invalid")
+
+def _split_listing(collection, filters, **kwargs):
+    """Fake list_documents result: one item per tag in the split tags filter, plus a shared one."""
+    tags = filters[-1]['value']
+    items = [{'id': tag, 'created_at': datetime(2024, 3, int(tag[3:]) + 1)} for tag in tags]
+    items.append({'id': 'shared', 'created_at': datetime(2024, 3, 31)})
+    return {'items': sorted(items, key=lambda item: item['created_at'], reverse=True)[:kwargs.get('limit')]}
+
+@pytest.mark.parametrize("manager_spec", [DOCUMENT_SPEC], indirect=True)
+def test_list_content_split_tags(manager, mock_metadata_manager):
+    """Test that a tags filter beyond Firestore's limit is split, merged and paginated."""
+    mock_metadata_manager.list_documents.side_effect = _split_listing
+    tags = [f"tag{i}" for i in range(12)]
+    
+    result = manager.list_content(page=1, per_page=5, filters=[('tags', 'array_contains_any', tags)])
+    
+    page_calls, id_calls = [], []
+    for call in mock_metadata_manager.list_documents.call_args_list:
+        (page_calls if 'limit' in call.kwargs else id_calls).append(call)
+    assert [call.kwargs['limit'] for call in page_calls] == [5, 5]
+    # Only the first chunk fills the window, so only its IDs are fetched to count it
+    assert [call.kwargs['fields'] for call in id_calls] == [[]]
+    assert [item['id'] for item in result['items']] == ['shared', 'tag11', 'tag10', 'tag9', 'tag8']
+    assert result['total'] == 13
+    assert result['pages'] == 3
+    assert result['next_cursor'] == {'created_at': datetime(2024, 3, 9), 'id': 'tag8'}
+
+@pytest.mark.parametrize("manager_spec", [DOCUMENT_SPEC], indirect=True)
+def test_list_content_split_tags_exact_total(manager, mock_metadata_manager):
+    """Test that the split listing needs no ID queries when every query fits in the window."""
+    mock_metadata_manager.list_documents.side_effect = _split_listing
+    tags = [f"tag{i}" for i in range(12)]
+    
+    result = manager.list_content(page=1, per_page=20, filters=[('tags', 'array_contains_any', tags)])
+    
+    assert mock_metadata_manager.list_documents.call_count == 2
+    assert result['total'] == 13
+    assert len(result['items']) == 13
+    assert result['next_cursor'] is None
+
+@pytest.mark.parametrize("manager_spec", [DOCUMENT_SPEC], indirect=True)
+def test_list_content_async(manager, monkeypatch):
+    """Test that async listing delegates to AsyncMetadataManager on the event loop."""
+    list_documents = AsyncMock(return_value={'items': [], 'total': 0})
+    monkeypatch.setattr(manager.async_metadata_manager, 'list_documents', list_documents)
+    
+    result = asyncio.run(manager.list_content_async(page=2, per_page=5, filters=[('tags', 'array_contains', 'a')]))
     
-    # Prevent pytest from trying to run tests from base class
-    __test__ = False
+    assert result == {'items': [], 'total': 0}
+    assert list_documents.await_args.kwargs['filters'] == [{'field': 'tags', 'op': 'array_contains', 'value': 'a'}]
+    assert (list_documents.await_args.kwargs['page'], list_documents.await_args.kwargs['per_page']) == (2, 5)
+
+def test_fork_drops_shared_state(fake_firestore):
+    """Test that a forked child rebuilds clients, collection references, bucket handles and managers."""
+    manager = _get_manager("documents")
+    manager._bucket_ref = object()
+    MetadataManager._col(manager.collection)
     
-    @pytest.fixture
-    def mock_metadata_manager(self):
-        """Mock MetadataManager methods."""
-        with patch('pl4m_utils.content_manager.MetadataManager') as mock_mm:
-            # Configure mock methods with complete metadata
-            mock_doc = {
-                'id': 'test-id',
-                'title': 'Test Post',
-                'description': 'Test Description',
-                'tags': ['test'],
-                'bucket': self.bucket_name,
-                'blob_path': '2024/03/test.txt',
-                'gcs_path': f'gs://{self.bucket_name}/2024/03/test.txt'
-            }
-            mock_mm.create_document.return_value = mock_doc
-            mock_mm.read_document.return_value = mock_doc
-            mock_mm.update_document.return_value = mock_doc
-            mock_mm.soft_delete.return_value = True
-            mock_mm.hard_delete_document.return_value = True
-            mock_mm.restore_document.return_value = True
-            yield mock_mm
-
-    @pytest.fixture
-    def manager(self, mock_storage_client, mock_metadata_manager):
-        """Initialize content manager with mocked dependencies."""
-        with patch('pl4m_utils.content_manager.storage.Client') as mock_client:
-            mock_client.return_value = mock_storage_client
-            manager = self.manager_class()
-            return manager
-
-    @pytest.fixture
-    def valid_content_path(self):
-        """Return a valid GCS path for the content type."""
-        return f"gs://{self.bucket_name}/2024/03/test{self.valid_extension}"
-
-    def test_generate_upload_url(self, manager):
-        """Test generating upload URL."""
-        url = manager.generate_upload_url(
-            f"test{self.valid_extension}",
-            self.content_type
-        )
-        assert url == "https://fake-signed-url"
-
-    def test_generate_upload_url_invalid_extension(self, manager):
-        """Test generating upload URL with invalid extension."""
-        with pytest.raises(ValueError, match="Invalid file extension"):
-            manager.generate_upload_url("test.invalid", "application/octet-stream")
-
-    def test_validate_metadata(self, manager, mock_metadata):
-        """Test metadata validation."""
-        manager._validate_metadata(mock_metadata)
-        
-        # Test missing tags
-        invalid_metadata = mock_metadata.copy()
-        del invalid_metadata['tags']
-        with pytest.raises(ValueError, match="must include 'tags'"):
-            manager._validate_metadata(invalid_metadata)
-
-    def test_delete_content(self, manager, mock_metadata):
-        """Test content deletion."""
-        # Setup mock for get_content
-        with patch.object(manager, 'get_content') as mock_get:
-            mock_get.return_value = {
-                'id': 'test-id',
-                'bucket': manager.BUCKET,
-                'blob_path': '2024/03/test.txt'
-            }
-            
-            # Test soft delete
-            assert manager.delete_content('test-id') is True
-            
-            # Test hard delete
-            assert manager.delete_content('test-id', hard_delete=True) is True
-
-    def test_restore_content(self, manager):
-        """Test content restoration."""
-        assert manager.restore_content('test-id') is True 
-
-class TestContentManager(TestContentManagerBase):
-    """Direct tests for ContentManager."""
+    pid = os.fork()
+    if pid == 0:
+        reset = (MetadataManager._db is None and MetadataManager._col.cache_info().currsize == 0
+                 and manager._bucket_ref is None and _get_manager.cache_info().currsize == 0)
+        os._exit(0 if reset else 1)
+    _, status = os.waitpid(pid, 0)
     
-    __test__ = True
-    manager_class = ContentManager
-    bucket_name = "test-bucket"
-    valid_extension = ".txt"
-    content_type = "text/plain"
-
-    @pytest.fixture
-    def manager(self):
-        """Override to provide required init args."""
-        return ContentManager(
-            collection="test-collection",
-            bucket=self.bucket_name,
-            valid_extensions={self.valid_extension}
-        )
-
-    def test_init(self):
-        """Test ContentManager initialization."""
-        manager = ContentManager(
-            collection="test-collection",
-            bucket="test-bucket",
-            valid_extensions={'.txt'}
-        )
-        assert manager.COLLECTION == "test-collection"
-        assert manager.BUCKET == "test-bucket"
-        assert manager.VALID_EXTENSIONS == {'.txt'}
-
-    def test_parse_gcs_path(self):
-        """Test GCS path parsing."""
-        bucket, path = ContentManager._parse_gcs_path("gs://test-bucket/path/to/file.txt")
-        assert bucket == "test-bucket"
-        assert path == "path/to/file.txt"
-
-        with pytest.raises(ValueError, match="must start with gs://"):
-            ContentManager._parse_gcs_path("invalid://path")
-
-    def test_generate_file_path(self, manager):
-        """Test file path generation."""
-        path = manager._generate_file_path("test.txt")
-        # Should match yyyy/mm/filename pattern
-        assert len(path.split('/')) == 3
-        assert path.endswith("test.txt")
-
-    def test_validate_extension(self, manager):
-        """Test file extension validation."""
-        manager._validate_extension("test.txt")
-        
-        with pytest.raises(ValueError, match="Invalid file extension"):
-            manager._validate_extension("test.invalid")
-
-    def test_validate_metadata_empty(self, manager):
-        """Test metadata validation with empty metadata."""
-        with pytest.raises(ValueError, match="must be a dictionary"):
-            manager._validate_metadata(None)
-
-    def test_validate_metadata_no_tags(self, manager):
-        """Test metadata validation without tags."""
-        with pytest.raises(ValueError, match="must include 'tags'"):
-            manager._validate_metadata({'description': 'test'})
-
-    def test_validate_metadata_invalid_tags(self, manager):
-        """Test metadata validation with invalid tags type."""
-        with pytest.raises(ValueError, match="must include 'tags'"):
-            manager._validate_metadata({'tags': 'not a list'}) 
\ No newline at end of file
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert MetadataManager._db is fake_firestore and manager._bucket_ref is not None
+    _get_manager.cache_clear()
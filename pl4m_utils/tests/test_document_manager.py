@@ -1,39 +1,43 @@
 import pytest
-from pl4m_utils.document_manager import DocumentManager
-from .test_content_manager import TestContentManagerBase
+from pl4m_utils import ContentManagerError
+from .test_content_manager import DOCUMENT_SPEC
 
-class TestDocumentManager(TestContentManagerBase):
-    """Test cases for DocumentManager."""
-    
-    __test__ = True
-    manager_class = DocumentManager
-    bucket_name = "tylers-platform-docs"
-    valid_extension = ".pdf"
-    content_type = "application/pdf"
+# Every test here runs against the documents content type
+pytestmark = pytest.mark.parametrize("manager_spec", [DOCUMENT_SPEC], indirect=True, ids=["documents"])
 
-    @pytest.fixture
-    def valid_document_metadata(self, mock_metadata):
-        """Provide valid document metadata."""
-        mock_metadata.update({
-            'title': 'Test Document',
-            'description': 'A test document',
-            'author': 'Test Author',
-            'page_count': 42
-        })
-        return mock_metadata
+@pytest.fixture
+def valid_document_metadata(valid_metadata):
+    """Provide valid document metadata."""
+    valid_metadata.update({
+        'title': 'Test Document',
+        'description': 'A test document',
+        'author': 'Test Author',
+        'page_count': 42
+    })
+    return valid_metadata
 
-    def test_create_document(self, manager, valid_document_metadata, valid_content_path):
-        """Test document creation."""
-        doc = manager.create_document(valid_content_path, valid_document_metadata)
-        assert doc is not None
-        assert doc.get('title') == 'Test Document'
+def test_upload_document(manager, valid_document_metadata, mock_metadata_manager):
+    """Test document upload."""
+    doc = manager.upload_new_content("test.pdf", b'%PDF-1.4', valid_document_metadata)
+    assert doc is not None
+    
+    collection, record = mock_metadata_manager.create_document.call_args.args
+    assert collection == manager.collection
+    assert record['title'] == 'Test Document'
+    assert record['content_type'] == 'application/pdf'
+    assert record['gcs_path'] == f"gs://{manager.bucket}/{record['blob_path']}"
 
-    def test_create_document_missing_required(self, manager, mock_metadata, valid_content_path):
-        """Test document creation with missing required fields."""
-        with pytest.raises(ValueError, match="Missing required metadata fields"):
-            manager.create_document(valid_content_path, mock_metadata)
+def test_upload_document_missing_required(manager, valid_metadata):
+    """Test document upload with missing required fields."""
+    del valid_metadata['title']
+    with pytest.raises(ContentManagerError, match="Missing required metadata fields"):
+        manager.upload_new_content("test.pdf", b'%PDF-1.4', valid_metadata)
 
-    def test_replace_document(self, manager):
-        """Test document replacement."""
-        updated = manager.replace_document('test-id', b'New PDF content')
-        assert updated is not None 
\ No newline at end of file
+def test_replace_document(manager, mock_metadata_manager):
+    """Test document replacement."""
+    updated = manager.update_content('test-id', b'New PDF content')
+    assert updated is not None
+    
+    _, _, updates = mock_metadata_manager.update_document.call_args.args
+    assert updates['size_bytes'] == len(b'New PDF content')
+    assert mock_metadata_manager.update_document.call_args.kwargs == {'return_server_state': True}
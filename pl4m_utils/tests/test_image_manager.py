@@ -1,34 +1,34 @@
 import pytest
-from pl4m_utils.image_manager import ImageManager
-from .test_content_manager import TestContentManagerBase
+from pl4m_utils import ContentManagerError
+from .test_content_manager import IMAGE_SPEC
 from datetime import datetime
 
-class TestImageManager(TestContentManagerBase):
-    """Test cases for ImageManager."""
-    
-    __test__ = True
-    manager_class = ImageManager
-    bucket_name = "tylers-platform-images"
-    valid_extension = ".jpg"
-    content_type = "image/jpeg"
+# Every test here runs against the images content type
+pytestmark = pytest.mark.parametrize("manager_spec", [IMAGE_SPEC], indirect=True, ids=["images"])
+
+# Fixed capture time keeps image metadata identical across runs
+_FIXED_TAKEN_AT = datetime(2024, 3, 15, 12, 0, 0)
 
-    @pytest.fixture
-    def valid_image_metadata(self, mock_metadata):
-        """Provide valid image metadata."""
-        mock_metadata.update({
-            'taken_at': datetime.utcnow(),
-            'description': 'Test image'
-        })
-        return mock_metadata
+@pytest.fixture
+def valid_image_metadata(valid_metadata):
+    """Provide valid image metadata."""
+    valid_metadata.update({
+        'taken_at': _FIXED_TAKEN_AT,
+        'description': 'Test image'
+    })
+    return valid_metadata
 
-    def test_create_image(self, manager, valid_image_metadata, valid_content_path):
-        """Test image creation."""
-        image = manager.create_image(valid_content_path, valid_image_metadata)
-        assert image is not None
-        assert 'taken_at' in image
+def test_upload_image(manager, valid_image_metadata, mock_metadata_manager):
+    """Test image upload."""
+    image = manager.upload_new_content("test.jpg", b'\xff\xd8\xff', valid_image_metadata)
+    assert image is not None
+    
+    _, record = mock_metadata_manager.create_document.call_args.args
+    assert record['taken_at'] == _FIXED_TAKEN_AT
+    assert record['content_type'] == 'image/jpeg'
 
-    def test_create_image_invalid_taken_at(self, manager, valid_image_metadata, valid_content_path):
-        """Test image creation with invalid taken_at."""
-        valid_image_metadata['taken_at'] = "not a datetime"
-        with pytest.raises(ValueError, match="taken_at must be a datetime"):
-            manager.create_image(valid_content_path, valid_image_metadata) 
\ No newline at end of file
+def test_upload_image_invalid_taken_at(manager, valid_image_metadata):
+    """Test image upload with invalid taken_at."""
+    valid_image_metadata['taken_at'] = "not a datetime"
+    with pytest.raises(ContentManagerError, match="'taken_at' must be of type"):
+        manager.upload_new_content("test.jpg", b'\xff\xd8\xff', valid_image_metadata)
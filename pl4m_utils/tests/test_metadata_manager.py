@@ -1,24 +1,38 @@
 import pytest
+from unittest.mock import AsyncMock, MagicMock
+from google.api_core.exceptions import NotFound, ServiceUnavailable
 from google.cloud import firestore
-from pl4m_utils.metadata_manager import MetadataManager  # Adjust import based on your module structure
+from pl4m_utils.metadata_manager import (  # Adjust import based on your module structure
+    BULK_WRITE_MAX_ATTEMPTS, DELETED_SUFFIX, TAG_INDEX_SUFFIX, AsyncMetadataManager, MetadataManager,
+    MetadataManagerError, NotFoundError, RetryableError,
+    _apply_updates, _check_filters, _merge_window, _partition_writes, _tag_deltas
+)
+import asyncio
+import os
 import time
 
+# Each pytest-xdist worker writes to its own collection, so workers never race
+_TEST_COLLECTION = f"test_metadata_{os.environ.get('PYTEST_XDIST_WORKER', 'gw0')}"
+
 # @pytest.fixture(scope="module")
 # def firestore_client():
 #     """Provides a Firestore client instance for testing."""
 #     return firestore.Client()
 
 @pytest.fixture(scope="module")
-def metadata_manager():
-    """Provides an instance of MetadataManager."""
-    return MetadataManager()
-
-@pytest.fixture
 def test_collection():
     """Returns a Firestore collection name for testing."""
-    return "test_metadata"
+    return _TEST_COLLECTION
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def live_collection(metadata_manager):
+    """Returns this worker's live Firestore test collection, emptied at the end of the run."""
+    yield _TEST_COLLECTION
+    db = metadata_manager.db()
+    for name in (_TEST_COLLECTION, f"{_TEST_COLLECTION}{DELETED_SUFFIX}", f"{_TEST_COLLECTION}{TAG_INDEX_SUFFIX}"):
+        db.recursive_delete(db.collection(name))
+
+@pytest.fixture(scope="module")
 def test_document():
     """Returns sample test data."""
     return {
@@ -27,61 +41,298 @@ def test_document():
         "value": 42
     }
 
-def test_create_document(metadata_manager, test_collection, test_document):
+@pytest.fixture(scope="module")
+def shared_doc_id(metadata_manager, live_collection, test_document):
+    """Creates one document for read-only tests in this module, deleted afterwards."""
+    doc_id = metadata_manager.create_document(live_collection, test_document)["id"]
+    yield doc_id
+    metadata_manager.hard_delete_document(live_collection, doc_id)
+
+@pytest.fixture
+def created_doc_id(metadata_manager, live_collection, test_document):
+    """Creates a fresh document for a test that modifies it, deleted afterwards."""
+    doc_id = metadata_manager.create_document(live_collection, test_document)["id"]
+    yield doc_id
+    metadata_manager.hard_delete_document(live_collection, doc_id)
+
+@pytest.mark.integration
+def test_create_document(metadata_manager, live_collection, test_document):
     """Test creating a Firestore document."""
-    created_doc = metadata_manager.create_document(test_collection, test_document)
+    created_doc = metadata_manager.create_document(live_collection, test_document)
     assert created_doc is not None
     assert created_doc["name"] == test_document["name"]
     assert "id" in created_doc
+    metadata_manager.hard_delete_document(live_collection, created_doc["id"])
 
-def test_read_document(metadata_manager, test_collection, test_document):
+@pytest.mark.integration
+def test_read_document(metadata_manager, live_collection, test_document, shared_doc_id):
     """Test reading a Firestore document."""
-    created_doc = metadata_manager.create_document(test_collection, test_document)
-    doc_id = created_doc["id"]
-    
-    retrieved_doc = metadata_manager.read_document(test_collection, doc_id)
+    retrieved_doc = metadata_manager.read_document(live_collection, shared_doc_id)
     assert retrieved_doc is not None
     assert retrieved_doc["name"] == test_document["name"]
 
-def test_update_document(metadata_manager, test_collection, test_document):
+@pytest.mark.integration
+def test_update_document(metadata_manager, live_collection, created_doc_id):
     """Test updating a Firestore document."""
-    created_doc = metadata_manager.create_document(test_collection, test_document)
-    doc_id = created_doc["id"]
-    
     updates = {"value": 100}
-    updated_doc = metadata_manager.update_document(test_collection, doc_id, updates)
+    updated_doc = metadata_manager.update_document(live_collection, created_doc_id, updates)
     assert updated_doc is not None
     assert updated_doc["value"] == 100
 
-def test_soft_delete_document(metadata_manager, test_collection, test_document):
-    """Test soft deleting a document."""
-    created_doc = metadata_manager.create_document(test_collection, test_document)
-    doc_id = created_doc["id"]
-    
-    assert metadata_manager.soft_delete(test_collection, doc_id) is True
-    deleted_doc = metadata_manager.read_document(test_collection, doc_id, include_deleted=True)
-    assert deleted_doc is not None
-    assert deleted_doc.get("deleted_at") is not None
+@pytest.mark.integration
+@pytest.mark.parametrize("include_deleted", [True, False])
+def test_soft_delete_document(metadata_manager, live_collection, created_doc_id, include_deleted):
+    """Test soft deleting a document, reading it back with and without deleted documents."""
+    assert metadata_manager.soft_delete(live_collection, created_doc_id) is True
+    deleted_doc = metadata_manager.read_document(live_collection, created_doc_id, include_deleted=include_deleted)
+    if include_deleted:
+        assert deleted_doc is not None
+        assert deleted_doc.get("deleted_at") is not None
+    else:
+        assert deleted_doc is None
 
-def test_restore_document(metadata_manager, test_collection, test_document):
+@pytest.mark.integration
+def test_restore_document(metadata_manager, live_collection, created_doc_id):
     """Test restoring a soft-deleted document."""
-    created_doc = metadata_manager.create_document(test_collection, test_document)
-    doc_id = created_doc["id"]
-    
-    metadata_manager.soft_delete(test_collection, doc_id)
-    assert metadata_manager.restore_document(test_collection, doc_id) is True
-    restored_doc = metadata_manager.read_document(test_collection, doc_id)
+    metadata_manager.soft_delete(live_collection, created_doc_id)
+    assert metadata_manager.restore_document(live_collection, created_doc_id) is True
+    restored_doc = metadata_manager.read_document(live_collection, created_doc_id)
     assert restored_doc["deleted_at"] is None
 
-def test_list_documents(metadata_manager, test_collection):
+@pytest.mark.integration
+def test_list_documents(metadata_manager, live_collection):
     """Test listing documents."""
-    docs = metadata_manager.list_documents(test_collection)
-    assert isinstance(docs, list)
+    docs = metadata_manager.list_documents(live_collection)
+    assert isinstance(docs['items'], list)
 
-def test_hard_delete_document(metadata_manager, test_collection, test_document):
+@pytest.mark.integration
+def test_hard_delete_document(metadata_manager, live_collection, created_doc_id):
     """Test permanently deleting a document."""
-    created_doc = metadata_manager.create_document(test_collection, test_document)
-    doc_id = created_doc["id"]
+    assert metadata_manager.hard_delete_document(live_collection, created_doc_id) is True
+    assert metadata_manager.read_document(live_collection, created_doc_id) is None
+
+def test_read_document_requires_ids():
+    """Test that reading without a collection or ID is rejected before any Firestore call."""
+    with pytest.raises(ValueError, match="must not be empty"):
+        MetadataManager.read_document("", "doc-id")
+
+def test_read_document_mocked(fake_firestore, test_collection):
+    """Test reading a live document through a mocked Firestore client."""
+    snapshot = MagicMock(exists=True)
+    snapshot.to_dict.return_value = {"id": "doc-id", "name": "Test Document", "deleted_at": None}
+    fake_firestore.collection.return_value.document.return_value.get.return_value = snapshot
+    
+    doc = MetadataManager.read_document(test_collection, "doc-id")
+    assert doc["name"] == "Test Document"
+    fake_firestore.collection.assert_called_with(test_collection)
+
+def test_read_document_mocked_missing(fake_firestore, test_collection):
+    """Test that a document missing from Firestore reads as None."""
+    fake_firestore.collection.return_value.document.return_value.get.return_value = MagicMock(exists=False)
+    assert MetadataManager.read_document(test_collection, "doc-id") is None
+
+@pytest.mark.parametrize("ttl_seconds, gets", [(None, 2), (60, 1)], ids=["uncached", "cached"])
+def test_read_document_cache_opt_in(fake_firestore, test_collection, ttl_seconds, gets):
+    """Test that only reads given a ttl_seconds are served from the read cache."""
+    snapshot = MagicMock(exists=True)
+    snapshot.to_dict.return_value = {"id": "doc-id", "name": "Test Document"}
+    doc_get = fake_firestore.collection.return_value.document.return_value.get
+    doc_get.return_value = snapshot
+    
+    for _ in range(2):
+        assert MetadataManager.read_document(test_collection, "doc-id", ttl_seconds=ttl_seconds)["name"] == "Test Document"
+    assert doc_get.call_count == gets
+
+def test_create_documents_bulk_counts_confirmed_tags(fake_firestore, test_collection):
+    """Test that only creates Firestore confirmed are added to the tag index."""
+    ids = iter(["doc-1", "doc-2"])
+    documents = fake_firestore.collection.return_value.document
+    documents.side_effect = lambda doc_id=None: MagicMock(id=doc_id or next(ids))
+    bulk_writer = fake_firestore.bulk_writer.return_value
+    
+    def close():
+        (first_ref, _), (second_ref, _) = (call.args for call in bulk_writer.create.call_args_list)
+        bulk_writer.on_write_result.call_args.args[0](first_ref, MagicMock(), bulk_writer)
+        bulk_writer.on_write_error.call_args.args[0](MagicMock(attempts=BULK_WRITE_MAX_ATTEMPTS, message="boom"),
+                                                     bulk_writer)
+    bulk_writer.close.side_effect = close
+    
+    with pytest.raises(MetadataManagerError, match="Failed to create 1 of 2 documents"):
+        MetadataManager.create_documents_bulk(test_collection, [{"tags": ["a", "b"]}, {"tags": ["b", "c"]}])
+    
+    tag_writes = {ref.id: data['count'].value for (ref, data), _ in fake_firestore.batch.return_value.set.call_args_list}
+    assert tag_writes == {"a": 1, "b": 1}
+
+def test_apply_updates():
+    """Test that updates are applied locally as Firestore would apply them."""
+    current = {"title": "Old", "tags": ["a"], "views": 1, "author": {"name": "A", "email": "a@x"}}
+    data = _apply_updates(current, {
+        "title": "New",
+        "tags": firestore.ArrayUnion(["a", "b"]),
+        "views": firestore.Increment(2),
+        "author.name": "B",
+        "author.email": firestore.DELETE_FIELD,
+        "stats.likes": firestore.Increment(1)
+    })
+    assert data == {"title": "New", "tags": ["a", "b"], "views": 3, "author": {"name": "B"}, "stats": {"likes": 1}}
+    assert current["author"] == {"name": "A", "email": "a@x"}
+
+@pytest.mark.parametrize("current, updates, expected", [
+    ({"tags": ["a", "b"]}, {"tags": ["b", "c"]}, {"a": -1, "c": 1}),
+    ({"tags": ["a"]}, {"deleted_at": firestore.SERVER_TIMESTAMP}, {"a": -1}),
+    ({"tags": ["a"], "deleted_at": "then"}, {"deleted_at": None}, {"a": 1}),
+    ({"tags": ["a"], "deleted_at": "then"}, {"tags": ["b"]}, {}),
+    ({"tags": ["a", "b"]}, None, {"a": -1, "b": -1})
+], ids=["retag", "soft-delete", "restore", "deleted-retag", "hard-delete"])
+def test_tag_deltas(current, updates, expected):
+    """Test the tag index changes an update makes."""
+    assert {tag: delta for tag, delta in _tag_deltas(current, updates).items() if delta} == expected
+
+@pytest.mark.parametrize("in_live, current, updates, expected", [
+    (True, {"title": "Old"}, {"title": "New"}, [("update", "live")]),
+    (True, {"title": "Old"}, {"deleted_at": firestore.SERVER_TIMESTAMP}, [("set", "deleted"), ("delete", "live")]),
+    (False, {"deleted_at": "then"}, {"deleted_at": None}, [("set", "live"), ("delete", "deleted")]),
+    (False, {"deleted_at": "then"}, None, [("delete", "deleted")])
+], ids=["update", "soft-delete", "restore", "hard-delete"])
+def test_partition_writes(in_live, current, updates, expected):
+    """Test that changing deleted_at moves a document between partitions."""
+    refs = {"live": MagicMock(), "deleted": MagicMock()}
+    writes = _partition_writes(refs["live"], refs["deleted"], in_live, current, updates)
+    assert [(operation, ref) for operation, ref, _ in writes] == [(operation, refs[name]) for operation, name in expected]
+
+@pytest.mark.parametrize("filters, message", [
+    ([{"field": "tags", "op": "=="}], "expected field, op and value"),
+    ([{"field": "tags", "op": "like", "value": "a"}], "unsupported operator"),
+    ([{"field": "tags", "op": "in", "value": "a"}], "requires a list value"),
+    ([{"field": "tags", "op": "not-in", "value": []}], "requires a non-empty list")
+], ids=["missing-value", "bad-op", "scalar-in", "empty-not-in"])
+def test_check_filters_invalid(filters, message):
+    """Test that malformed filters are rejected."""
+    with pytest.raises(ValueError, match=message):
+        _check_filters(filters)
+
+def test_check_filters_matchable():
+    """Test that only an empty 'in' list makes filters unmatchable."""
+    assert _check_filters(None) is True
+    assert _check_filters([{"field": "tags", "op": "array_contains_any", "value": ["a"]}]) is True
+    assert _check_filters([{"field": "id", "op": "in", "value": []}]) is False
+
+@pytest.mark.parametrize("descending, expected", [
+    (True, ["d", "c", "b", "a"]),
+    (False, ["a", "b", "c", "d"])
+], ids=["descending", "ascending"])
+def test_merge_window(descending, expected):
+    """Test that partition streams merge in order, ties broken by ID."""
+    live = [{"id": "a", "n": 1}, {"id": "c", "n": 2}, {"id": "d", "n": 3}]
+    deleted = [{"id": "b", "n": 2}]
+    if descending:
+        live.reverse()
+    merged = _merge_window([iter(live), iter(deleted)], "n", descending)
+    assert [data["id"] for data in merged] == expected
+    assert _merge_window([iter(live), iter(deleted)], "n", descending, offset=1, limit=2) == merged[1:3]
+
+def test_list_documents_cursor(fake_firestore, test_collection):
+    """Test that list cursors carry the document ID to break sort ties."""
+    ordered = fake_firestore.collection.return_value.order_by.return_value.order_by.return_value
+    ordered.count.return_value.get.return_value = [[MagicMock(value=3)]]
+    snapshots = [MagicMock(id=doc_id) for doc_id in ("doc-2", "doc-3")]
+    for snapshot in snapshots:
+        snapshot.to_dict.return_value = {"created_at": 5}
+    ordered.start_after.return_value.limit.return_value.stream.return_value = snapshots
+    
+    result = MetadataManager.list_documents(test_collection, per_page=2, start_after={"created_at": 5, "id": "doc-1"})
+    
+    ordered.start_after.assert_called_once_with({"created_at": 5, "__name__": "doc-1"})
+    assert [item["id"] for item in result["items"]] == ["doc-2", "doc-3"]
+    assert result["next_cursor"] == {"created_at": 5, "id": "doc-3"}
+    assert result["total"] == 3
+
+def test_async_read_many(fake_async_firestore, test_collection):
+    """Test that async reads of many documents are gathered, in order."""
+    snapshots = {doc_id: MagicMock(exists=True) for doc_id in ("doc-1", "doc-2")}
+    for doc_id, snapshot in snapshots.items():
+        snapshot.to_dict.return_value = {"id": doc_id}
+    documents = fake_async_firestore.collection.return_value.document
+    documents.side_effect = lambda doc_id: MagicMock(get=AsyncMock(return_value=snapshots[doc_id]))
+    
+    docs = asyncio.run(AsyncMetadataManager.read_many(test_collection, ["doc-2", "doc-1"]))
+    assert [doc["id"] for doc in docs] == ["doc-2", "doc-1"]
+
+def test_async_list_documents(fake_async_firestore, test_collection):
+    """Test that an async page carries its count and an ID-tiebroken next_cursor."""
+    ordered = fake_async_firestore.collection.return_value.order_by.return_value.order_by.return_value
+    ordered.count.return_value.get = AsyncMock(return_value=[[MagicMock(value=3)]])
+    snapshots = [MagicMock(id=doc_id) for doc_id in ("doc-1", "doc-2")]
+    for snapshot in snapshots:
+        snapshot.to_dict.return_value = {"created_at": 5}
+    
+    async def stream():
+        for snapshot in snapshots:
+            yield snapshot
+    ordered.limit.return_value.stream = stream
+    
+    result = asyncio.run(AsyncMetadataManager.list_documents(test_collection, per_page=2))
+    
+    assert [item["id"] for item in result["items"]] == ["doc-1", "doc-2"]
+    assert result["total"] == 3
+    assert result["pages"] == 2
+    assert result["next_cursor"] == {"created_at": 5, "id": "doc-2"}
+
+@pytest.mark.parametrize("error, expected", [
+    (NotFound("gone"), NotFoundError),
+    (ServiceUnavailable("unavailable"), RetryableError),
+    (RuntimeError("boom"), MetadataManagerError)
+], ids=["not-found", "unavailable", "other"])
+def test_hard_delete_document_errors(monkeypatch, test_collection, error, expected):
+    """Test that hard delete failures map to the typed MetadataManagerError hierarchy."""
+    monkeypatch.setattr(MetadataManager, '_write_tracking_tags', MagicMock(side_effect=error))
+    with pytest.raises(expected, match="Failed to hard-delete document"):
+        MetadataManager.hard_delete_document(test_collection, "doc-id")
+
+@pytest.fixture
+def fake_partitions(fake_firestore, test_collection):
+    """Stored documents by path, served through the mocked client's collections and get_all."""
+    stored = {}
+    
+    def collection(name):
+        return MagicMock(document=lambda doc_id: MagicMock(id=doc_id, path=f"{name}/{doc_id}"))
+    
+    def snapshot(ref):
+        data = stored.get(ref.path)
+        found = MagicMock(id=ref.id, reference=ref, exists=data is not None)
+        found.to_dict.return_value = dict(data or {})
+        found.get.side_effect = lambda field: (data or {})[field]
+        return found
+    
+    fake_firestore.collection.side_effect = collection
+    fake_firestore.get_all.side_effect = lambda refs, field_paths=None: [snapshot(ref) for ref in refs]
+    return stored
+
+def test_soft_delete_many(fake_firestore, fake_partitions, test_collection):
+    """Test that each batch moves its documents together with their tag counts."""
+    fake_partitions[f"{test_collection}/doc-1"] = {"tags": ["a"], "deleted_at": None}
+    fake_partitions[f"{test_collection}/doc-2"] = {"tags": ["a", "b"], "deleted_at": None}
+    batch = fake_firestore.batch.return_value
+    
+    assert MetadataManager.soft_delete_many(test_collection, ["doc-1", "doc-2"]) is True
+    
+    batch.commit.assert_called_once()
+    moved = [ref.path for ref, _ in (call.args for call in batch.set.call_args_list) if ref.id.startswith("doc")]
+    assert moved == [f"{test_collection}{DELETED_SUFFIX}/doc-1", f"{test_collection}{DELETED_SUFFIX}/doc-2"]
+    tag_counts = {ref.id: data["count"].value for (ref, data), kwargs in batch.set.call_args_list if kwargs}
+    assert tag_counts == {"a": -2, "b": -1}
+
+@pytest.mark.parametrize("stored_path, error, message", [
+    (None, NotFoundError, "not found: doc-2"),
+    (DELETED_SUFFIX, ValueError, "already deleted: doc-2")
+], ids=["missing", "already-deleted"])
+def test_soft_delete_many_refuses_before_writing(fake_firestore, fake_partitions, test_collection,
+                                                 stored_path, error, message):
+    """Test that a missing or already deleted document stops the whole call before any write."""
+    fake_partitions[f"{test_collection}/doc-1"] = {"tags": ["a"], "deleted_at": None}
+    if stored_path is not None:
+        fake_partitions[f"{test_collection}{stored_path}/doc-2"] = {"deleted_at": "then"}
     
-    assert metadata_manager.hard_delete_document(test_collection, doc_id) is True
-    assert metadata_manager.read_document(test_collection, doc_id) is None
\ No newline at end of file
+    with pytest.raises(error, match=message):
+        MetadataManager.soft_delete_many(test_collection, ["doc-1", "doc-2"])
+    fake_firestore.batch.return_value.commit.assert_not_called()